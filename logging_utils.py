@@ -0,0 +1,60 @@
+# logging_utils.py
+# Helper functions for moving log file and console writes off the calling thread
+
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Background listener that owns the real file/console handlers
+_listener = None
+
+def setup_queue_logging(log_file, level=logging.INFO):
+    """
+    Configure the root logger so that log calls only enqueue the record and a
+    background thread performs the actual file and console writes
+
+    Args:
+        log_file (str): Path of the log file to write to (UTF-8)
+        level (int): Root logger level
+
+    Returns:
+        QueueListener: The running listener, or None if logging was already configured
+    """
+    global _listener
+
+    root = logging.getLogger()
+
+    # Behave like logging.basicConfig() and leave an existing configuration alone
+    if root.handlers:
+        return None
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    # Make sure queued records reach the disk before the interpreter exits
+    atexit.register(stop_queue_logging)
+
+    return _listener
+
+def stop_queue_logging():
+    """Flush any queued log records and stop the background writer thread"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
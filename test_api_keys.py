@@ -1,11 +1,19 @@
 # test_api_keys.py
 # Simple utility to test all API keys for the trading bot
 
+import io
 import os
+import sys
+import time
+import random
 import requests
 import logging
+import threading
+from functools import lru_cache
 from dotenv import load_dotenv
-from openai import OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure basic logging
 logging.basicConfig(
@@ -14,45 +22,134 @@ logging.basicConfig(
 )
 logger = logging.getLogger('api_test')
 
-# Load environment variables
-load_dotenv()
+@lru_cache(maxsize=1)
+def _env():
+    """
+    Load the .env file on first use
+    
+    Returns:
+        os._Environ: The process environment, including the .env values
+    """
+    load_dotenv()
+    return os.environ
+
+# Keep-alive session for News API requests, same setup as the trader's SESSION.
+# Transient failures and rate limits are retried with backoff.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True
+    )
+))
+
+def _mask_key(key):
+    """Show only the first and last 4 characters of a key (nothing for short or missing keys)"""
+    if not key or len(key) < 8:
+        return "****"
+    return f"{key[:4]}...{key[-4:]}"
+
+def _is_transient(error):
+    """Check whether an API error is worth retrying (timeouts, dropped connections, 429 and 5xx)"""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    
+    # The OpenAI SDK uses httpx, so its timeouts and dropped connections have their own types
+    try:
+        import openai
+        if isinstance(error, openai.APIConnectionError):  # Includes APITimeoutError
+            return True
+    except ImportError:
+        pass
+    
+    status = getattr(error, "status_code", None)
+    return status == 429 or (isinstance(status, int) and status >= 500)
+
+def _retry(fn, tries=3, base=0.3, cap=3.0):
+    """
+    Call fn(), retrying transient failures with exponential backoff and full jitter
+    
+    Args:
+        fn (callable): Function to call with no arguments
+        tries (int): Maximum number of attempts
+        base (float): Backoff for the first retry in seconds, doubled each retry
+        cap (float): Upper limit of the backoff in seconds
+        
+    Returns:
+        The value returned by fn()
+    """
+    for attempt in range(tries):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == tries - 1 or not _is_transient(e):
+                raise
+            time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+def _alpaca_credentials():
+    """
+    Read the Alpaca credentials from the environment
+    
+    Returns:
+        tuple: (key_id, secret_key, base_url), keys are None when not set
+    """
+    env = _env()
+    key_id = env.get("APCA_API_KEY_ID") or env.get("ALPACA_API_KEY")
+    secret_key = env.get("APCA_API_SECRET_KEY") or env.get("ALPACA_SECRET_KEY")
+    base_url = env.get("ALPACA_PAPER_URL", "https://paper-api.alpaca.markets")
+    return key_id, secret_key, base_url
 
-# API Keys
-NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-APCA_API_KEY_ID = os.getenv("APCA_API_KEY_ID") or os.getenv("ALPACA_API_KEY")
-APCA_API_SECRET_KEY = os.getenv("APCA_API_SECRET_KEY") or os.getenv("ALPACA_SECRET_KEY")
-ALPACA_PAPER_URL = os.getenv("ALPACA_PAPER_URL", "https://paper-api.alpaca.markets")
+@lru_cache(maxsize=1)
+def get_alpaca():
+    """
+    Create the Alpaca REST client once and share it between callers
+    
+    Returns:
+        tradeapi.REST: Client whose session keeps its connections alive
+    """
+    import alpaca_trade_api as tradeapi
+    
+    key_id, secret_key, base_url = _alpaca_credentials()
+    alpaca = tradeapi.REST(key_id, secret_key, base_url, api_version='v2')
+    
+    # Keep connections alive and pooled so later calls skip the TCP/TLS handshake
+    alpaca._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+    return alpaca
 
 def test_alpaca_api():
     """Test Alpaca API connection"""
     try:
-        import alpaca_trade_api as tradeapi
+        key_id, secret_key, _ = _alpaca_credentials()
         
         print("\n=== Testing Alpaca API ===")
-        print(f"API Key ID: {APCA_API_KEY_ID[:4]}...{APCA_API_KEY_ID[-4:]}")
-        print(f"API Secret: {APCA_API_SECRET_KEY[:4]}...{APCA_API_SECRET_KEY[-4:]}")
+        print(f"API Key ID: {_mask_key(key_id)}")
+        print(f"API Secret: {_mask_key(secret_key)}")
         
-        if not APCA_API_KEY_ID or not APCA_API_SECRET_KEY:
+        if not key_id or not secret_key:
             print("[ERROR] Alpaca API keys not found in .env file")
             return False
         
-        alpaca = tradeapi.REST(
-            APCA_API_KEY_ID,
-            APCA_API_SECRET_KEY,
-            ALPACA_PAPER_URL,
-            api_version='v2'
-        )
+        alpaca = get_alpaca()
+        
+        # The account and clock requests are independent, so send them together.
+        # Only the requests run on the pool; printing stays on this thread's buffer.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            account_future = executor.submit(_retry, alpaca.get_account)
+            clock_future = executor.submit(_retry, alpaca.get_clock)
+            account = account_future.result()
+            clock = clock_future.result()
         
         # Test account info
-        account = alpaca.get_account()
         print(f"[SUCCESS] Successfully connected to Alpaca account: {account.id}")
         print(f"   Account status: {account.status}")
         print(f"   Cash balance: ${float(account.cash):.2f}")
         print(f"   Portfolio value: ${float(account.portfolio_value):.2f}")
         
         # Test market hours
-        clock = alpaca.get_clock()
         market_status = "OPEN" if clock.is_open else "CLOSED"
         print(f"[SUCCESS] Market is currently {market_status}")
         
@@ -64,35 +161,37 @@ def test_alpaca_api():
 def test_openai_api():
     """Test OpenAI API connection"""
     try:
+        from openai import OpenAI
+        
         print("\n=== Testing OpenAI API ===")
-        api_key = OPENAI_API_KEY
+        api_key = _env().get("OPENAI_API_KEY")
         
         if not api_key:
             print("[ERROR] OpenAI API key not found in .env file")
             return False
         
         # Only show first and last 4 characters of the key for security
-        print(f"API Key: {api_key[:4]}...{api_key[-4:]}")
+        print(f"API Key: {_mask_key(api_key)}")
         
-        # Initialize the client
-        client = OpenAI(api_key=api_key)
+        # Initialize the client (retries are left to _retry so they don't stack with the SDK's own)
+        client = OpenAI(api_key=api_key, max_retries=0)
         
         # Make a simple API call
-        response = client.chat.completions.create(
+        response = _retry(lambda: client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant."},
                 {"role": "user", "content": "Say hello"}
             ],
             max_tokens=10
-        )
+        ))
         
         response_text = response.choices[0].message.content
         print(f"[SUCCESS] Successfully called OpenAI API")
         print(f"   Response: '{response_text}'")
         
         # Get available models
-        models = client.models.list()
+        models = _retry(client.models.list)
         print(f"[SUCCESS] Available models include: {', '.join([model.id for model in models.data[:3]])}...")
         
         return True
@@ -104,18 +203,18 @@ def test_news_api():
     """Test News API connection"""
     try:
         print("\n=== Testing News API ===")
-        api_key = NEWS_API_KEY
+        api_key = _env().get("NEWS_API_KEY")
         
         if not api_key:
             print("[ERROR] News API key not found in .env file")
             return False
         
         # Only show first and last 4 characters of the key for security
-        print(f"API Key: {api_key[:4]}...{api_key[-4:]}")
+        print(f"API Key: {_mask_key(api_key)}")
         
         # Make a simple API call
         url = f"https://newsapi.org/v2/everything?q=AAPL&language=en&pageSize=1&apiKey={api_key}"
-        response = requests.get(url)
+        response = SESSION.get(url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -133,14 +232,50 @@ def test_news_api():
         print(f"[ERROR] News API Error: {e}")
         return False
 
+class ThreadOutput:
+    """Stand-in for sys.stdout that sends each thread's prints to its own buffer, if it has one"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def run_buffered(self, test):
+        """Run a test function, returning its result and everything it printed"""
+        self.local.buffer = io.StringIO()
+        try:
+            return test(), self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = None
+
 def main():
     """Main function to test all APIs"""
     print("=== Trading Bot API Key Test Utility ===")
     print("Testing all API connections required by the trading bot...")
     
-    alpaca_success = test_alpaca_api()
-    openai_success = test_openai_api()
-    news_success = test_news_api()
+    # Read the .env file before the tests start so they don't race to load it
+    _env()
+    
+    # The tests are independent network calls, so run them at the same time. Each
+    # test's output is buffered and printed in order so the sections don't interleave.
+    output = ThreadOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            test_runs = list(executor.map(output.run_buffered, [test_alpaca_api, test_openai_api, test_news_api]))
+    finally:
+        sys.stdout = output.stream
+    
+    for _, test_output in test_runs:
+        sys.stdout.write(test_output)
+    
+    (alpaca_success, _), (openai_success, _), (news_success, _) = test_runs
     
     print("\n=== Summary ===")
     print(f"Alpaca API: {'[SUCCESS] Working' if alpaca_success else '[ERROR] Failed'}")
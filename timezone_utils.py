@@ -1,12 +1,84 @@
 # timezone_utils.py
 # Helper functions for timezone conversion and market time calculations
 
+import time
 import datetime
 import pytz
 import logging
+import threading
+from functools import lru_cache, wraps
 
 logger = logging.getLogger('timezone_utils')
 
+# Timezone objects are built once instead of looked up on every call
+_UTC = pytz.UTC
+_EASTERN = pytz.timezone('US/Eastern')
+
+# How long a market clock answer from Alpaca is reused
+CLOCK_CACHE_SECONDS = 30
+
+def ttl_cache(seconds):
+    """
+    Decorator that reuses a function's result for the same arguments for a while
+    
+    Entries also expire at the next minute boundary, so an answer that changes at a
+    market open or close (always on the minute) is never served past it.
+    
+    Args:
+        seconds (float): Longest time a result is reused
+        
+    Returns:
+        callable: The decorator
+    """
+    def decorator(func):
+        cache = {}  # args -> (monotonic expiry time, result)
+        lock = threading.Lock()
+        
+        @wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(args)
+            if entry is not None and now < entry[0]:
+                return entry[1]
+            
+            result = func(*args)
+            lifetime = min(seconds, 60 - time.time() % 60)
+            with lock:
+                cache[args] = (now + lifetime, result)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+@ttl_cache(CLOCK_CACHE_SECONDS)
+def get_clock_cached(api):
+    """
+    Get the Alpaca market clock, reusing the last answer for up to CLOCK_CACHE_SECONDS
+    
+    Args:
+        api (tradeapi.REST): Alpaca REST client
+        
+    Returns:
+        Clock: The Alpaca clock entity
+    """
+    return api.get_clock()
+
+def format_time(dt):
+    """
+    Format a datetime as 'YYYY-MM-DD HH:MM:SS TZ' without going through strftime
+    
+    Args:
+        dt (datetime): Datetime to format, naive or timezone aware
+        
+    Returns:
+        str: The formatted time, with the timezone name if dt has one
+    """
+    text = dt.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
+    tz_name = dt.tzname()
+    return f"{text} {tz_name}" if tz_name else text
+
 def get_eastern_time():
     """
     Get the current time in US Eastern Time (ET), which is the timezone for US markets
@@ -15,41 +87,42 @@ def get_eastern_time():
         datetime: Current datetime in Eastern Time
     """
     # Get current UTC time
-    utc_now = datetime.datetime.now(pytz.UTC)
+    utc_now = datetime.datetime.now(_UTC)
     
     # Convert to Eastern Time
-    eastern = pytz.timezone('US/Eastern')
-    eastern_time = utc_now.astimezone(eastern)
+    eastern_time = utc_now.astimezone(_EASTERN)
     
-    # Log for debugging
-    logger.debug(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.debug(f"Eastern time: {eastern_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.debug(f"Is DST active: {eastern_time.dst() != datetime.timedelta(0)}")
+    # Log for debugging (skipped entirely unless debug logging is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("UTC time: %s", format_time(utc_now))
+        logger.debug("Eastern time: %s", format_time(eastern_time))
+        logger.debug("Is DST active: %s", eastern_time.dst() != datetime.timedelta(0))
     
     return eastern_time
 
 def log_current_time():
     """Log the current time in various timezones for debugging"""
-    # Get current time in various timezones
-    now_utc = datetime.datetime.now(pytz.UTC)
-    eastern = pytz.timezone('US/Eastern')
-    now_et = now_utc.astimezone(eastern)
-    now_local = datetime.datetime.now()
+    # Get current time in various timezones, all from a single clock read
+    now_utc = datetime.datetime.now(_UTC)
+    now_et = now_utc.astimezone(_EASTERN)
     
-    # Try to get the local timezone name
+    # Try to get the local time and timezone name
     try:
-        local_tz = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
+        now_local = now_utc.astimezone()
+        local_tz = now_local.tzinfo
+        now_local = now_local.replace(tzinfo=None)
     except:
+        now_local = datetime.datetime.now()
         local_tz = "Unknown"
     
     # Log all times with detailed information
-    logger.info(f"Current times - UTC: {now_utc.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.info(f"Current times - ET:  {now_et.strftime('%Y-%m-%d %H:%M:%S %Z')} (DST active: {now_et.dst() != datetime.timedelta(0)})")
-    logger.info(f"Current times - Local: {now_local.strftime('%Y-%m-%d %H:%M:%S')} (timezone: {local_tz})")
+    logger.info("Current times - UTC: %s", format_time(now_utc))
+    logger.info("Current times - ET:  %s (DST active: %s)", format_time(now_et), now_et.dst() != datetime.timedelta(0))
+    logger.info("Current times - Local: %s (timezone: %s)", format_time(now_local), local_tz)
     
     # Get the current market period
     period_key, period_name, interval = get_current_market_period()
-    logger.info(f"Current market period: {period_key} ({period_name}), interval: {interval} minutes")
+    logger.info("Current market period: %s (%s), interval: %s minutes", period_key, period_name, interval)
     
     return now_et
 
@@ -60,17 +133,43 @@ def get_current_market_period():
     Returns:
         tuple: (period_key, period_name, interval_minutes)
     """
-    # Get current Eastern Time
-    et_now = get_eastern_time()
+    # The period can only change on a minute boundary, so the timezone
+    # conversion is done once per minute and repeated calls reuse it
+    return _market_period_for_minute(int(time.time() // 60))
+
+@lru_cache(maxsize=1)
+def _market_period_for_minute(minute_epoch):
+    """
+    Look up the market period for a given minute
     
-    # Extract hour (0-23) in Eastern Time
+    Args:
+        minute_epoch (int): Minutes since the Unix epoch
+        
+    Returns:
+        tuple: (period_key, period_name, interval_minutes)
+    """
+    # Extract hour (0-23) and minute in Eastern Time
+    et_now = datetime.datetime.fromtimestamp(minute_epoch * 60, _EASTERN)
     et_hour = et_now.hour
     et_minute = et_now.minute
     
     # Log the hour for debugging
-    logger.debug(f"Current hour in ET: {et_hour}")
+    logger.debug("Current hour in ET: %s", et_hour)
     
-    # Determine the period based on time
+    # All period boundaries fall on the half hour
+    return MARKET_PERIOD_BY_HALF_HOUR[et_hour * 2 + et_minute // 30]
+
+def resolve_market_period(et_hour, et_minute):
+    """
+    Map an Eastern Time hour and minute to its market period
+    
+    Args:
+        et_hour (int): Hour in Eastern Time (0-23)
+        et_minute (int): Minute of the hour
+        
+    Returns:
+        tuple: (period_key, period_name, interval_minutes)
+    """
     if 4 <= et_hour < 9 or (et_hour == 9 and et_minute < 30):
         return ("pre_market", "Pre-market", 15)
     elif (et_hour == 9 and et_minute >= 30) or (et_hour == 10 and et_minute < 30):
@@ -90,30 +189,45 @@ def get_current_market_period():
     else:  # 0 <= et_hour < 4
         return ("overnight", "Overnight", 90)
 
-def log_current_time():
-    """Log the current time in various timezones for debugging"""
-    # Get current time in various timezones
-    now_utc = datetime.datetime.now(pytz.UTC)
-    eastern = pytz.timezone('US/Eastern')
-    now_et = now_utc.astimezone(eastern)
-    now_local = datetime.datetime.now()
+# Market period for each half hour of the day, indexed by hour * 2 + minute // 30
+MARKET_PERIOD_BY_HALF_HOUR = tuple(
+    resolve_market_period(slot // 2, (slot % 2) * 30) for slot in range(48)
+)
+
+# Polling is tightened this close to the market open or close
+OPEN_CLOSE_WINDOW_SECONDS = 5 * 60
+
+def effective_interval_seconds(clock, news_backlog=0, interval_minutes=None):
+    """
+    Get the polling interval for right now, adjusted for the market state
     
-    # Try to get the local timezone name
-    try:
-        local_tz = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
-    except:
-        local_tz = "Unknown"
+    The period's interval is doubled while the market is closed and there is no
+    news waiting to be acted on, and halved in the last minutes before the market
+    opens or closes.
     
-    # Log all times with detailed information
-    logger.info(f"Current times - UTC: {now_utc.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.info(f"Current times - ET:  {now_et.strftime('%Y-%m-%d %H:%M:%S %Z')} (DST active: {now_et.dst() != datetime.timedelta(0)})")
-    logger.info(f"Current times - Local: {now_local.strftime('%Y-%m-%d %H:%M:%S')} (timezone: {local_tz})")
+    Args:
+        clock: Alpaca clock entity, or None if it couldn't be fetched
+        news_backlog (int): Number of news-driven items still waiting
+        interval_minutes (float): Base interval, defaults to the current period's
+        
+    Returns:
+        float: Seconds to wait before the next check
+    """
+    if interval_minutes is None:
+        _, _, interval_minutes = get_current_market_period()
+    seconds = interval_minutes * 60
     
-    # Get the current market period
-    period_key, period_name, interval = get_current_market_period()
-    logger.info(f"Current market period: {period_key} ({period_name}), interval: {interval} minutes")
+    if clock is None:
+        return seconds
     
-    return now_et
+    if not clock.is_open and not news_backlog:
+        seconds *= 2
+    
+    boundary = clock.next_close if clock.is_open else clock.next_open
+    if (boundary - datetime.datetime.now(_UTC)).total_seconds() <= OPEN_CLOSE_WINDOW_SECONDS:
+        seconds *= 0.5
+    
+    return seconds
 
 if __name__ == "__main__":
     # Configure logging when run directly
@@ -126,7 +240,7 @@ if __name__ == "__main__":
     # Test and print timezone information
     logger.info("=== Testing timezone utilities ===")
     et_time = log_current_time()
-    print(f"ET Time: {et_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+    print(f"ET Time: {format_time(et_time)}")
     print(f"Is DST active: {et_time.dst() != datetime.timedelta(0)}")
     print(f"Current ET hour: {et_time.hour}")
     
@@ -8,6 +8,7 @@ import datetime
 from pathlib import Path
 import alpaca_trade_api as tradeapi
 from dotenv import load_dotenv
+from trader_utils import migrate_json_history
 
 # Configure logging
 logging.basicConfig(
@@ -38,9 +39,19 @@ alpaca = tradeapi.REST(
 
 # Configuration
 QUEUE_FILE = "data/trade_queue.json"
-TRADE_HISTORY_FILE = "data/trade_history.json"
+TRADE_HISTORY_FILE = "data/trade_history.jsonl"  # One JSON record per line, appended to
+LEGACY_TRADE_HISTORY_FILE = "data/trade_history.json"  # Old JSON-array history, converted on first use
 MAX_POSITION_PCT = 0.1  # Maximum 10% of portfolio in one position
 
+def migrate_trade_history():
+    """Move the records of an old data/trade_history.json into the JSON Lines history, if it still exists"""
+    try:
+        count = migrate_json_history(LEGACY_TRADE_HISTORY_FILE, TRADE_HISTORY_FILE)
+        if count:
+            logger.info(f"Migrated {count} records from {LEGACY_TRADE_HISTORY_FILE} to {TRADE_HISTORY_FILE}")
+    except Exception as e:
+        logger.error(f"Error migrating old trade history: {e}")
+
 class TradeQueue:
     """Handles trade queueing and execution"""
     
@@ -49,7 +60,10 @@ class TradeQueue:
         # Ensure data directory exists
         Path("data").mkdir(exist_ok=True)
         self.load_queue()
-        self.load_history()
+        
+        # Only the records added since the last save_history(), not the full history
+        # (the file is only appended to, use load_history() to read all of it)
+        self.history = []
     
     def load_queue(self):
         """Load the trade queue from file"""
@@ -68,32 +82,50 @@ class TradeQueue:
     def save_queue(self):
         """Save the trade queue to file"""
         try:
-            with open(QUEUE_FILE, "w") as f:
-                json.dump(self.queue, f, indent=2)
+            # Serialize in one go, write to a temp file and swap it in so a crash can't leave a partial file
+            data = json.dumps(self.queue, indent=2)
+            tmp_file = f"{QUEUE_FILE}.tmp"
+            with open(tmp_file, "w") as f:
+                f.write(data)
+            os.replace(tmp_file, QUEUE_FILE)
             logger.info(f"Saved {len(self.queue)} queued trades")
         except Exception as e:
             logger.error(f"Error saving trade queue: {e}")
     
     def load_history(self):
-        """Load trade history from file"""
+        """
+        Load the full trade history from file
+        
+        Returns:
+            list: History records, oldest first
+        """
+        migrate_trade_history()
+        
         history_file = Path(TRADE_HISTORY_FILE)
-        if history_file.exists():
-            try:
-                with open(history_file, "r") as f:
-                    self.history = json.load(f)
-                logger.info(f"Loaded trade history with {len(self.history)} records")
-            except Exception as e:
-                logger.error(f"Error loading trade history: {e}")
-                self.history = []
-        else:
-            self.history = []
+        if not history_file.exists():
+            return []
+        
+        try:
+            with open(history_file, "r") as f:
+                history = [json.loads(line) for line in f if line.strip()]
+            logger.info(f"Loaded trade history with {len(history)} records")
+            return history
+        except Exception as e:
+            logger.error(f"Error loading trade history: {e}")
+            return []
     
     def save_history(self):
-        """Save trade history to file"""
+        """Append new trade history records to file"""
+        if not self.history:
+            return
+        
+        migrate_trade_history()
+        
         try:
-            with open(TRADE_HISTORY_FILE, "w") as f:
-                json.dump(self.history, f, indent=2)
-            logger.info(f"Saved trade history with {len(self.history)} records")
+            with open(TRADE_HISTORY_FILE, "a") as f:
+                f.writelines(json.dumps(record) + "\n" for record in self.history)
+            logger.info(f"Saved {len(self.history)} records to trade history")
+            self.history = []
         except Exception as e:
             logger.error(f"Error saving trade history: {e}")
     
@@ -12,6 +12,7 @@ from openai import OpenAI
 import alpaca_trade_api as tradeapi
 import requests
 import yfinance as yf
+from trader_utils import migrate_json_history
 
 # Configure logging with UTF-8 encoding
 logging.basicConfig(
@@ -49,7 +50,17 @@ alpaca = tradeapi.REST(
 # Configuration
 MAX_POSITION_PCT = 0.1  # Maximum 10% of portfolio in one position
 QUEUE_FILE = "data/trade_queue.json"
-TRADE_HISTORY_FILE = "data/trade_history.json"
+TRADE_HISTORY_FILE = "data/trade_history.jsonl"  # One JSON record per line, appended to
+LEGACY_TRADE_HISTORY_FILE = "data/trade_history.json"  # Old JSON-array history, converted on first use
+
+def migrate_trade_history():
+    """Move the records of an old data/trade_history.json into the JSON Lines history, if it still exists"""
+    try:
+        count = migrate_json_history(LEGACY_TRADE_HISTORY_FILE, TRADE_HISTORY_FILE)
+        if count:
+            logger.info(f"Migrated {count} records from {LEGACY_TRADE_HISTORY_FILE} to {TRADE_HISTORY_FILE}")
+    except Exception as e:
+        logger.error(f"Error migrating old trade history: {e}")
 
 def is_market_open():
     """Check if the market is currently open"""
@@ -136,22 +147,15 @@ Article:
                 {"role": "system", "content": "You are a market-savvy financial assistant."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.3
+            temperature=0.3,
+            # JSON mode guarantees the whole reply is one JSON object
+            response_format={"type": "json_object"}
         )
         
         content = response.choices[0].message.content
         logger.info("Sentiment analysis completed")
         
-        # Extract JSON from response
-        start = content.find("{")
-        end = content.rfind("}") + 1
-        if start == -1 or end == 0:
-            logger.error("Invalid JSON format in GPT response")
-            return {"sentiment": "Neutral", "related_companies": []}
-            
-        json_blob = content[start:end]
-        parsed = json.loads(json_blob)
-        return parsed
+        return json.loads(content)
     except Exception as e:
         logger.error(f"Error analyzing sentiment: {e}")
         return {"sentiment": "Neutral", "related_companies": []}
@@ -266,8 +270,12 @@ def load_queue():
 def save_queue(queue):
     """Save the trade queue to file"""
     try:
-        with open(QUEUE_FILE, "w") as f:
-            json.dump(queue, f, indent=2)
+        # Serialize in one go, write to a temp file and swap it in so a crash can't leave a partial file
+        data = json.dumps(queue, indent=2)
+        tmp_file = f"{QUEUE_FILE}.tmp"
+        with open(tmp_file, "w") as f:
+            f.write(data)
+        os.replace(tmp_file, QUEUE_FILE)
         logger.info(f"Saved {len(queue)} queued trades")
     except Exception as e:
         logger.error(f"Error saving trade queue: {e}")
@@ -566,30 +574,19 @@ def process_queue():
     return results
 
 def save_trade_history(results):
-    """Save trade execution results to history file"""
+    """Append trade execution results to the history file"""
+    migrate_trade_history()
+    
     try:
-        # Load existing history
-        history = []
-        history_file = Path(TRADE_HISTORY_FILE)
-        if history_file.exists():
-            try:
-                with open(history_file, "r") as f:
-                    history = json.load(f)
-            except:
-                history = []
-        
         # Add timestamp to results
         execution_record = {
             "timestamp": datetime.datetime.now().isoformat(),
             "results": results
         }
         
-        # Add to history
-        history.append(execution_record)
-        
-        # Save updated history
-        with open(TRADE_HISTORY_FILE, "w") as f:
-            json.dump(history, f, indent=2)
+        # Append as one line, the existing history is never read or rewritten
+        with open(TRADE_HISTORY_FILE, "a") as f:
+            f.write(json.dumps(execution_record) + "\n")
         
         logger.info(f"Saved execution results to trade history ({len(results)} trades)")
     except Exception as e:
@@ -0,0 +1,80 @@
+# trader_utils.py
+# Helper functions shared by the traders and the trade queue scripts
+
+import os
+import json
+from pathlib import Path
+
+# Use orjson for state, order and result files if available (faster than the stdlib encoder)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def truncate_article(text, max_length=1000):
+    """Truncate article text to keep GPT prompts short"""
+    if len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
+
+def dump_json_bytes(data):
+    """
+    Serialize data to indented JSON bytes, using orjson when it is installed
+    
+    Args:
+        data: JSON-compatible object (NumPy scalars and arrays are allowed with orjson)
+    
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+def load_json_bytes(raw):
+    """
+    Parse JSON from bytes or str, using orjson when it is installed
+    
+    Args:
+        raw (bytes): UTF-8 encoded JSON
+    
+    Returns:
+        The decoded object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def migrate_json_history(legacy_file, jsonl_file):
+    """
+    Convert an old JSON-array history file into the JSON Lines file, once
+    
+    The old records go before any lines already in the JSON Lines file, which
+    are newer. The old file is renamed to <legacy_file>.migrated, so it is kept
+    but not converted again.
+    
+    Args:
+        legacy_file (str): Path of the old history file (one JSON list)
+        jsonl_file (str): Path of the JSON Lines history file
+        
+    Returns:
+        int: Number of records migrated (0 if there was nothing to migrate)
+    """
+    legacy_path = Path(legacy_file)
+    if not legacy_path.exists():
+        return 0
+    
+    records = json.loads(legacy_path.read_text() or "[]")
+    jsonl_path = Path(jsonl_file)
+    newer_lines = jsonl_path.read_text() if jsonl_path.exists() else ""
+    
+    # Write to a temp file and swap it in so a crash can't lose either history
+    tmp_path = Path(f"{jsonl_file}.tmp")
+    with open(tmp_path, "w") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+        f.write(newer_lines)
+    os.replace(tmp_path, jsonl_path)
+    os.replace(legacy_path, f"{legacy_file}.migrated")
+    
+    return len(records)
@@ -4,17 +4,25 @@
 import os
 import time
 import json
+import queue
+import hashlib
 import logging
 import datetime
 import requests
 import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
+from types import SimpleNamespace
+from collections import OrderedDict, deque
 from dotenv import load_dotenv
 from openai import OpenAI
 import alpaca_trade_api as tradeapi
+from alpaca_trade_api.rest import APIError, RetryException
 import pandas as pd
 import pytz
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Configure logging
 logging.basicConfig(
@@ -37,12 +45,22 @@ except ImportError:
 
 # Import timezone utilities if available
 try:
-    from timezone_utils import get_eastern_time, get_current_market_period
+    from timezone_utils import get_eastern_time, get_current_market_period, get_clock_cached
     TIMEZONE_UTILS_AVAILABLE = True
 except ImportError:
     TIMEZONE_UTILS_AVAILABLE = False
     logger.warning("Timezone utilities not found, using approximate Eastern Time")
 
+# JSON and article helpers shared with the other trader (orjson is used when installed)
+from trader_utils import truncate_article, dump_json_bytes, load_json_bytes
+
+# Use Parquet for saved opening range bars if pyarrow is available
+try:
+    import pyarrow
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
@@ -65,6 +83,21 @@ if not NEWS_API_KEY:
 # Initialize OpenAI client
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
 
+# Default (connect, read) timeout for HTTP requests that don't set their own
+HTTP_TIMEOUT = (3, 10)
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to requests sent without one"""
+    
+    def __init__(self, *args, timeout=HTTP_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+    
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
 # Initialize Alpaca API
 alpaca = tradeapi.REST(
     APCA_API_KEY_ID,
@@ -73,15 +106,34 @@ alpaca = tradeapi.REST(
     api_version='v2'
 )
 
-# Create necessary directories
+# The SDK already sends every call through one keep-alive requests.Session, but its
+# default pool keeps only 10 connections per host. Symbols are scanned from several
+# threads, so give it a larger pool. The SDK does its own retries, so the adapter doesn't.
+# The SDK never passes a timeout, so the adapter also bounds every call.
+alpaca._session.mount("https://", TimeoutHTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=0)
+))
+
+# Create necessary directories (once, the save paths don't recheck them)
 Path("data").mkdir(exist_ok=True)
 Path("data/orders").mkdir(exist_ok=True)
 Path("data/orb_data").mkdir(exist_ok=True)
 
 # Configuration
 SYMBOLS_TO_TRACK = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "AMD", "INTC", "IBM"]
+SYMBOLS_SET = frozenset(SYMBOLS_TO_TRACK)
 INITIAL_CAPITAL = 10000
 MAX_POSITION_PCT = 0.1  # Maximum 10% of portfolio in one position
+# Errors an Alpaca request can fail with (rejected request, rate limit retries used up,
+# network failure); anything else is a bug and is logged with its traceback
+ALPACA_ERRORS = (APIError, RetryException, requests.exceptions.RequestException)
+
+CYCLE_TIME_BUDGET_SECONDS = 300  # Symbols not started within this time are skipped
+NEWS_ANALYSIS_WORKERS = 8  # Concurrent GPT requests when analyzing articles
+SCAN_WORKERS = 8  # Symbols processed concurrently in a trading cycle
+OPENAI_MODEL = "gpt-4o-mini"  # Model used for news article analysis
 
 # ORB Strategy Configuration
 ORB_TIMEFRAME = 15  # Opening range in minutes (usually 15 or 30)
@@ -91,45 +143,40 @@ ORB_STOP_LOSS_PCT = 0.005  # Stop loss at 0.5%
 MARKET_OPEN_HOUR = 9
 MARKET_OPEN_MINUTE = 30
 
-# Windows-friendly timeout implementation 
-class TimeoutError(Exception):
-    """Custom timeout error for Windows compatibility"""
-    pass
+# Timezones used by the Eastern time fallback, looked up once at import
+_UTC_TZ = pytz.UTC
+_EASTERN_TZ = pytz.timezone('US/Eastern')
+MAX_SENTIMENT_ENTRIES = 5  # Most recent news sentiment entries kept per symbol
+BARS_CACHE_MINUTES = 5  # How long fetched bars are kept in memory
 
-def with_timeout(timeout_seconds, default_result=None):
-    """
-    Decorator to run a function with a timeout (Windows compatible)
-    
-    Args:
-        timeout_seconds: Maximum time to allow function to run
-        default_result: Result to return if timeout occurs
-    """
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            result = [default_result]
-            exception = [None]
-            
-            def target():
-                try:
-                    result[0] = func(*args, **kwargs)
-                except Exception as e:
-                    exception[0] = e
-            
-            thread = threading.Thread(target=target)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout_seconds)
-            
-            if thread.is_alive():
-                logger.warning(f"Function {func.__name__} timed out after {timeout_seconds} seconds")
-                raise TimeoutError(f"Function {func.__name__} timed out after {timeout_seconds} seconds")
-            
-            if exception[0]:
-                raise exception[0]
-                
-            return result[0]
-        return wrapper
-    return decorator
+# Common company name variations (casefolded) mapped to their symbol
+_COMPANY_ALIASES = {
+    "apple": "AAPL",
+    "microsoft": "MSFT",
+    "amazon": "AMZN",
+    "google": "GOOGL",
+    "alphabet": "GOOGL",
+    "meta": "META",
+    "facebook": "META",
+    "tesla": "TSLA",
+    "nvidia": "NVDA",
+    "amd": "AMD",
+    "advanced micro devices": "AMD",
+    "intel": "INTC",
+    "ibm": "IBM",
+    "international business machines": "IBM"
+}
+
+# Integer codes for trading signals (and back), so signals compare as small ints
+_SIG = {"BUY": 1, "SELL": -1, "HOLD": 0}
+_SIG_INV = {code: signal for signal, code in _SIG.items()}
+
+# Numeric score for each news sentiment label (unknown labels count as Neutral)
+_SENT_MAP = {
+    "Bullish": 1.0,
+    "Neutral": 0.5,
+    "Bearish": 0.0
+}
 
 class ORBNewsTrader:
     """
@@ -143,6 +190,31 @@ class ORBNewsTrader:
         self.orb_signals = {}  # Store current ORB signals
         self.news_sentiment = {}  # Store news sentiment for symbols
         self.positions = {}  # Store current positions
+        self._cycle_start = time.monotonic()  # Start of the current trading cycle
+        self._last_state_hash = None  # Digest of the last saved/loaded state content
+        self._bars_cache = OrderedDict()  # (symbol, timeframe, limit, minute) -> bars DataFrame
+        self._bars_cache_lock = threading.Lock()  # Symbols are scanned from worker threads
+        self._orb_lock = threading.Lock()  # Guards orb_ranges updates from worker threads
+        self._queue_lock = threading.Lock()  # Serializes read-modify-write of the trade queue file
+        
+        # Order details are written to disk by a background thread, off the trade path.
+        # The thread is started by the first save and stopped by flush_order_details().
+        self._persist_q = queue.Queue()
+        self._persist_thread = None
+        self._persist_lock = threading.Lock()  # Guards starting/stopping the writer thread
+        
+        # Keep-alive session for News API requests (reuses the TLS connection between calls)
+        self._http = requests.Session()
+        self._http.mount("https://", TimeoutHTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
+        
+        # Today's opening range window, rebuilt when the Eastern date changes
+        self._today_date = None
+        self._today_open_ts = None
+        self._today_range_end_ts = None
         
         # Load previous state if exists
         self.load_state()
@@ -152,24 +224,50 @@ class ORBNewsTrader:
         state_file = Path("data/orb_state.json")
         if state_file.exists():
             try:
-                with open(state_file, "r") as f:
-                    state = json.load(f)
-                    self.orb_ranges = state.get("orb_ranges", {})
-                    self.news_sentiment = state.get("news_sentiment", {})
+                state = load_json_bytes(state_file.read_bytes())
+                self.orb_ranges = state.get("orb_ranges", {})
+                self.news_sentiment = {
+                    symbol: deque(entries, maxlen=MAX_SENTIMENT_ENTRIES)
+                    for symbol, entries in state.get("news_sentiment", {}).items()
+                }
+                self._last_state_hash = self.get_state_hash()
                 logger.info(f"Loaded previous state with {len(self.orb_ranges)} ORB ranges")
             except Exception as e:
                 logger.error(f"Error loading state: {e}")
     
+    def get_state_content(self):
+        """Get the serializable state content (without the last_updated timestamp)"""
+        with self._orb_lock:
+            orb_ranges = dict(self.orb_ranges)
+        return {
+            "orb_ranges": orb_ranges,
+            "news_sentiment": {symbol: list(entries) for symbol, entries in self.news_sentiment.items()}
+        }
+    
+    def get_state_hash(self, content=None):
+        """Get a digest of the state content"""
+        if content is None:
+            content = self.get_state_content()
+        return hashlib.blake2b(dump_json_bytes(content), digest_size=8).digest()
+    
     def save_state(self):
         """Save current trading state"""
         try:
-            state = {
-                "orb_ranges": self.orb_ranges,
-                "news_sentiment": self.news_sentiment,
-                "last_updated": datetime.datetime.now().isoformat()
-            }
-            with open("data/orb_state.json", "w") as f:
-                json.dump(state, f, indent=2)
+            # Skip the write if nothing but the timestamp would change
+            state = self.get_state_content()
+            state_hash = self.get_state_hash(state)
+            if state_hash == self._last_state_hash:
+                logger.info("Trading state unchanged, not saving")
+                return
+            
+            state["last_updated"] = datetime.datetime.now().isoformat()
+            
+            # Write to a temp file and swap it in so a crash can't leave a partial file
+            tmp_file = Path("data/orb_state.json.tmp")
+            tmp_file.write_bytes(dump_json_bytes(state))
+            os.replace(tmp_file, "data/orb_state.json")
+            
+            self._last_state_hash = state_hash
             logger.info("Saved current trading state")
         except Exception as e:
             logger.error(f"Error saving state: {e}")
@@ -180,14 +278,13 @@ class ORBNewsTrader:
             return get_eastern_time()
         else:
             # Fallback if timezone_utils is not available
-            utc_now = datetime.datetime.now(pytz.UTC)
-            eastern = pytz.timezone('US/Eastern')
-            return utc_now.astimezone(eastern)
+            return datetime.datetime.now(_UTC_TZ).astimezone(_EASTERN_TZ)
     
     def is_market_open(self):
         """Check if the market is currently open"""
         try:
-            clock = alpaca.get_clock()
+            # The open/closed answer is stable for minutes, so reuse it when we can
+            clock = get_clock_cached(alpaca) if TIMEZONE_UTILS_AVAILABLE else alpaca.get_clock()
             return clock.is_open
         except Exception as e:
             logger.error(f"Error checking market hours: {e}")
@@ -213,25 +310,112 @@ class ORBNewsTrader:
             logger.error(f"Error getting market data for {symbol}: {e}")
             return None
     
-    def fetch_historical_bars(self, symbol, timeframe="15Min", limit=100):
-        """Fetch historical bars for a symbol"""
+    def get_current_market_data_batch(self, symbols):
+        """
+        Get current market data for several symbols with a single API request
+        
+        Args:
+            symbols (list): Symbols to quote
+            
+        Returns:
+            dict: Market data per symbol, in the same format as get_current_market_data()
+        """
         try:
-            # End time should be now
+            quotes = alpaca.get_latest_quotes(list(symbols))
+            timestamp = datetime.datetime.now().isoformat()
+            
+            market_data = {}
+            for symbol, quote in quotes.items():
+                bid_price = float(quote.bid_price)
+                ask_price = float(quote.ask_price)
+                market_data[symbol] = {
+                    "symbol": symbol,
+                    "bid": bid_price,
+                    "ask": ask_price,
+                    "mid": (bid_price + ask_price) / 2,
+                    "timestamp": timestamp
+                }
+            return market_data
+        except Exception as e:
+            logger.error(f"Error getting market data for {', '.join(symbols)}: {e}")
+            return {}
+    
+    def get_buy_price(self, symbol, price_data=None):
+        """
+        Get the price to size a buy with
+        
+        Uses the ask from the cycle's batch quote when there is one. Otherwise
+        makes a single snapshot request and uses the ask price, falling back to
+        the last trade and then the last minute bar close when the quote is
+        missing or zero.
+        
+        Args:
+            symbol (str): Symbol to price
+            price_data (dict): Market data from get_current_market_data_batch()
+        
+        Returns:
+            float: Price, or None if the snapshot has no usable price
+        """
+        if price_data and price_data.get("ask"):
+            return price_data["ask"]
+        
+        snapshot = alpaca.get_snapshot(symbol)
+        
+        quote = snapshot.latest_quote
+        trade = snapshot.latest_trade
+        bar = snapshot.minute_bar
+        
+        for price in (quote and quote.ask_price, trade and trade.price, bar and bar.close):
+            if price:
+                return float(price)
+        return None
+    
+    def get_bars_window(self, timeframe, limit, end_time=None):
+        """
+        Get the start and end timestamps covering the last `limit` bars
+        
+        Args:
+            timeframe (str): Bar timeframe (1Min, 5Min, 15Min or daily)
+            limit (int): Number of bars to cover
+            end_time (datetime): Timezone-aware end of the window, defaults to now
+            
+        Returns:
+            tuple: (start_str, end_str) ISO timestamps for the Alpaca API
+        """
+        # End time should be now unless the caller already has it
+        if end_time is None:
             end_time = pd.Timestamp.now(tz="America/New_York")
+        else:
+            end_time = pd.Timestamp(end_time)
+        
+        # Calculate start time based on limit and timeframe
+        if timeframe == "1Min":
+            start_time = end_time - pd.Timedelta(minutes=limit)
+        elif timeframe == "5Min":
+            start_time = end_time - pd.Timedelta(minutes=limit*5)
+        elif timeframe == "15Min":
+            start_time = end_time - pd.Timedelta(minutes=limit*15)
+        else:
+            start_time = end_time - pd.Timedelta(days=limit)
+        
+        # Format timestamps for Alpaca API
+        return start_time.isoformat(), end_time.isoformat()
+    
+    def fetch_historical_bars(self, symbol, timeframe="15Min", limit=100, end_time=None):
+        """Fetch historical bars for a symbol, ending at end_time (default now)"""
+        try:
+            if end_time is None:
+                end_time = pd.Timestamp.now(tz="America/New_York")
             
-            # Calculate start time based on limit and timeframe
-            if timeframe == "1Min":
-                start_time = end_time - pd.Timedelta(minutes=limit)
-            elif timeframe == "5Min":
-                start_time = end_time - pd.Timedelta(minutes=limit*5)
-            elif timeframe == "15Min":
-                start_time = end_time - pd.Timedelta(minutes=limit*15)
-            else:
-                start_time = end_time - pd.Timedelta(days=limit)
-                
-            # Format timestamps for Alpaca API
-            start_str = start_time.isoformat()
-            end_str = end_time.isoformat()
+            # Reuse bars already fetched for the same request within the same minute
+            minute = pd.Timestamp(end_time).floor("1min")
+            cache_key = (symbol, timeframe, limit, minute)
+            with self._bars_cache_lock:
+                cached_bars = self._bars_cache.get(cache_key)
+            if cached_bars is not None:
+                return cached_bars
+            
+            start_str, end_str = self.get_bars_window(timeframe, limit, end_time)
             
             bars = alpaca.get_bars(
                 symbol, 
@@ -244,6 +428,13 @@ class ORBNewsTrader:
             if bars.empty:
                 logger.warning(f"No historical data found for {symbol}")
                 return None
+            
+            # Drop entries older than the cache window (the dict is in insertion order)
+            oldest_minute = minute - pd.Timedelta(minutes=BARS_CACHE_MINUTES)
+            with self._bars_cache_lock:
+                while self._bars_cache and next(iter(self._bars_cache))[3] < oldest_minute:
+                    self._bars_cache.popitem(last=False)
+                self._bars_cache[cache_key] = bars
                 
             return bars
             
@@ -251,10 +442,71 @@ class ORBNewsTrader:
             logger.error(f"Error fetching bars for {symbol}: {e}")
             return None
     
-    def calculate_opening_range(self, symbol):
+    def fetch_historical_bars_multi(self, symbols, timeframe="15Min", limit=100, end_time=None):
+        """
+        Fetch historical bars for several symbols with a single API request
+        
+        Args:
+            symbols (list): Symbols to fetch
+            timeframe (str): Bar timeframe
+            limit (int): Number of bars per symbol
+            end_time (datetime): Timezone-aware end of the window, defaults to now
+            
+        Returns:
+            DataFrame: Bars for all symbols with a `symbol` column, or None if no data
+        """
+        try:
+            start_str, end_str = self.get_bars_window(timeframe, limit, end_time)
+            
+            # The SDK applies the limit to the whole response, not per symbol
+            bars = alpaca.get_bars(
+                list(symbols),
+                timeframe,
+                start=start_str,
+                end=end_str,
+                limit=limit * len(symbols)
+            ).df
+            
+            if bars.empty:
+                logger.warning(f"No historical data found for {', '.join(symbols)}")
+                return None
+            
+            return bars
+            
+        except Exception as e:
+            logger.error(f"Error fetching bars for {', '.join(symbols)}: {e}")
+            return None
+    
+    def get_opening_range_window(self, et_now):
+        """
+        Get today's opening range start and end timestamps
+        
+        The timestamps are built once per Eastern date and reused for every symbol.
+        
+        Args:
+            et_now (datetime): Current Eastern time
+            
+        Returns:
+            tuple: (market_open_time, range_end_time) as Eastern pd.Timestamps
+        """
+        today = et_now.date()
+        if self._today_date != today:
+            self._today_open_ts = pd.Timestamp.combine(
+                today, datetime.time(MARKET_OPEN_HOUR, MARKET_OPEN_MINUTE)
+            ).tz_localize("America/New_York")
+            self._today_range_end_ts = self._today_open_ts + pd.Timedelta(minutes=ORB_TIMEFRAME)
+            self._today_date = today
+        
+        return self._today_open_ts, self._today_range_end_ts
+    
+    def calculate_opening_range(self, symbol, bars=None):
         """
         Calculate the opening range for a symbol
         The opening range is defined as the high and low during the first X minutes of trading
+        
+        Args:
+            symbol (str): Symbol to calculate the range for
+            bars (DataFrame): Optional pre-fetched 1-minute bars for the symbol
         """
         try:
             # Get current ET time
@@ -267,22 +519,16 @@ class ORBNewsTrader:
                     logger.info(f"Using existing opening range for {symbol}")
                     return self.orb_ranges[symbol]
             
-            # Get 1-minute bars for today
-            bars = self.fetch_historical_bars(symbol, timeframe="1Min", limit=60)
+            # Get 1-minute bars for today unless they were fetched in a batch
+            if bars is None:
+                bars = self.fetch_historical_bars(symbol, timeframe="1Min", limit=60, end_time=et_now)
             
             if bars is None or bars.empty:
                 logger.warning(f"No bars available to calculate opening range for {symbol}")
                 return None
             
             # Filter bars from market open to market open + ORB_TIMEFRAME
-            market_open_time = pd.Timestamp(
-                year=et_now.year, month=et_now.month, day=et_now.day,
-                hour=MARKET_OPEN_HOUR, minute=MARKET_OPEN_MINUTE,
-                tz="America/New_York"
-            )
-            
-            # Calculate end of opening range
-            range_end_time = market_open_time + pd.Timedelta(minutes=ORB_TIMEFRAME)
+            market_open_time, range_end_time = self.get_opening_range_window(et_now)
             
             # Filter bars within opening range
             opening_bars = bars[(bars.index >= market_open_time) & (bars.index <= range_end_time)]
@@ -299,7 +545,7 @@ class ORBNewsTrader:
                 range_end_time = market_open_time + pd.Timedelta(minutes=ORB_TIMEFRAME)
                 
                 # Get yesterday's data
-                yesterday_bars = self.fetch_historical_bars(symbol, timeframe="1Min", limit=60*8)
+                yesterday_bars = self.fetch_historical_bars(symbol, timeframe="1Min", limit=60*8, end_time=et_now)
                 if yesterday_bars is not None and not yesterday_bars.empty:
                     opening_bars = yesterday_bars[(yesterday_bars.index >= market_open_time) & 
                                                 (yesterday_bars.index <= range_end_time)]
@@ -312,34 +558,97 @@ class ORBNewsTrader:
             opening_high = opening_bars['high'].max()
             opening_low = opening_bars['low'].min()
             
-            # Calculate midpoint of opening range
-            midpoint = (opening_high + opening_low) / 2
-            
-            # Store the opening range
-            orb_data = {
-                "symbol": symbol,
-                "date": et_now.strftime("%Y-%m-%d"),
-                "range_start": market_open_time.isoformat(),
-                "range_end": range_end_time.isoformat(),
-                "high": float(opening_high),
-                "low": float(opening_low),
-                "midpoint": float(midpoint),
-                "calculated_at": et_now.isoformat()
-            }
-            
-            # Save to instance variable
-            self.orb_ranges[symbol] = orb_data
-            
-            # Save ORB data to file
-            self.save_orb_data(symbol, orb_data, opening_bars)
-            
-            logger.info(f"Calculated opening range for {symbol}: high=${opening_high:.2f}, low=${opening_low:.2f}")
-            return orb_data
+            return self.store_opening_range(
+                symbol, et_now, market_open_time, range_end_time,
+                opening_high, opening_low, opening_bars
+            )
             
         except Exception as e:
             logger.error(f"Error calculating opening range for {symbol}: {e}")
             return None
     
+    def calculate_opening_ranges(self, symbols):
+        """
+        Calculate today's opening range for several symbols at once
+        
+        Bars for all symbols are fetched in one request and the highs/lows are
+        reduced in a single groupby. Symbols that get no bars inside today's
+        window fall back to calculate_opening_range(), which also tries the
+        previous session.
+        
+        Args:
+            symbols (list): Symbols to calculate the range for
+        """
+        et_now = self.get_eastern_time()
+        
+        # Opening range window for today
+        market_open_time, range_end_time = self.get_opening_range_window(et_now)
+        
+        calculated = set()
+        all_bars_by_symbol = {}
+        try:
+            bars = self.fetch_historical_bars_multi(symbols, timeframe="1Min", limit=60, end_time=et_now)
+            
+            if bars is not None:
+                # Each symbol's full batch, so the fallback below doesn't fetch the bars again
+                all_bars_by_symbol = {
+                    symbol: symbol_bars.drop(columns="symbol")
+                    for symbol, symbol_bars in bars.groupby("symbol")
+                }
+                
+                opening_bars = bars[(bars.index >= market_open_time) & (bars.index <= range_end_time)]
+                
+                # One vectorized pass for every symbol's high and low
+                ranges = opening_bars.groupby("symbol").agg(high=("high", "max"), low=("low", "min"))
+                bars_by_symbol = dict(tuple(opening_bars.groupby("symbol")))
+                
+                for symbol, row in ranges.to_dict("index").items():
+                    self.store_opening_range(
+                        symbol, et_now, market_open_time, range_end_time,
+                        row["high"], row["low"], bars_by_symbol[symbol].drop(columns="symbol")
+                    )
+                    calculated.add(symbol)
+        except Exception as e:
+            logger.error(f"Error calculating opening ranges: {e}")
+        
+        # Per-symbol fallback for anything the batch did not cover, reusing its bars
+        for symbol in symbols:
+            if symbol not in calculated:
+                self.calculate_opening_range(symbol, bars=all_bars_by_symbol.get(symbol))
+    
+    def store_opening_range(self, symbol, et_now, market_open_time, range_end_time,
+                            opening_high, opening_low, opening_bars):
+        """
+        Store a calculated opening range on the instance and save it to file
+        
+        Returns:
+            dict: The stored ORB data
+        """
+        # Calculate midpoint of opening range
+        midpoint = (opening_high + opening_low) / 2
+        
+        # Store the opening range
+        orb_data = {
+            "symbol": symbol,
+            "date": et_now.strftime("%Y-%m-%d"),
+            "range_start": market_open_time.isoformat(),
+            "range_end": range_end_time.isoformat(),
+            "high": float(opening_high),
+            "low": float(opening_low),
+            "midpoint": float(midpoint),
+            "calculated_at": et_now.isoformat()
+        }
+        
+        # Save to instance variable
+        with self._orb_lock:
+            self.orb_ranges[symbol] = orb_data
+        
+        # Save ORB data to file
+        self.save_orb_data(symbol, orb_data, opening_bars)
+        
+        logger.info(f"Calculated opening range for {symbol}: high=${opening_high:.2f}, low=${opening_low:.2f}")
+        return orb_data
+    
     def save_orb_data(self, symbol, orb_data, opening_bars):
         """Save ORB data to file for later analysis"""
         try:
@@ -348,15 +657,30 @@ class ORBNewsTrader:
             with open(f"data/orb_data/{symbol}_{date_str}_orb.json", "w") as f:
                 json.dump(orb_data, f, indent=2)
             
-            # Save the opening range bars to CSV
+            # Save the opening range bars, partitioned by date when writing Parquet
             if opening_bars is not None and not opening_bars.empty:
-                opening_bars.to_csv(f"data/orb_data/{symbol}_{date_str}_orb_bars.csv")
+                if PARQUET_AVAILABLE:
+                    date_dir = Path(f"data/orb_data/{date_str}")
+                    date_dir.mkdir(exist_ok=True)
+                    opening_bars.assign(symbol=symbol).to_parquet(
+                        date_dir / f"{symbol}.parquet",
+                        engine="pyarrow",
+                        compression="snappy"
+                    )
+                else:
+                    opening_bars.to_csv(f"data/orb_data/{symbol}_{date_str}_orb_bars.csv")
                 
         except Exception as e:
             logger.error(f"Error saving ORB data for {symbol}: {e}")
     
-    def check_orb_signals(self, symbol):
-        """Check for ORB breakout signals"""
+    def check_orb_signals(self, symbol, price_data=None):
+        """
+        Check for ORB breakout signals
+        
+        Args:
+            symbol (str): Symbol to check
+            price_data (dict): Optional pre-fetched market data for the symbol
+        """
         try:
             # First, make sure we have the opening range calculated
             orb_range = self.orb_ranges.get(symbol)
@@ -366,8 +690,9 @@ class ORBNewsTrader:
                     logger.warning(f"Cannot check ORB signals for {symbol} without opening range")
                     return None
             
-            # Get current price data
-            price_data = self.get_current_market_data(symbol)
+            # Get current price data unless it was fetched in a batch
+            if price_data is None:
+                price_data = self.get_current_market_data(symbol)
             if not price_data:
                 logger.warning(f"Cannot check ORB signals for {symbol} without current price")
                 return None
@@ -404,6 +729,7 @@ class ORBNewsTrader:
                 "high_breakout": high_breakout,
                 "low_breakout": low_breakout,
                 "signal": signal,
+                "signal_code": _SIG[signal],
                 "timestamp": datetime.datetime.now().isoformat()
             }
             
@@ -416,16 +742,28 @@ class ORBNewsTrader:
             logger.error(f"Error checking ORB signals for {symbol}: {e}")
             return None
     
-    @with_timeout(30, [])
     def fetch_news_articles(self, symbols, max_results=5):
         """Fetch news articles about the given symbols with timeout handling"""
         # Create a query string with all symbols
-        query = " OR ".join([symbol for symbol in symbols[:5]])  # Limit to 5 symbols to avoid long queries
-        url = f"https://newsapi.org/v2/everything?q={query}&language=en&sortBy=publishedAt&pageSize={max_results}&apiKey={NEWS_API_KEY}"
+        query = " OR ".join(symbols[:5])  # Limit to 5 symbols to avoid long queries
+        
+        # Let requests encode the query string
+        params = {
+            "q": query,
+            "language": "en",
+            "sortBy": "publishedAt",
+            "pageSize": max_results,
+            "apiKey": NEWS_API_KEY
+        }
 
         logger.info(f"Fetching news with query: {query}")
         
-        response = requests.get(url, timeout=20)
+        try:
+            # (connect, read) timeouts bound the whole request without a watchdog thread
+            response = self._http.get("https://newsapi.org/v2/everything", params=params, timeout=(5, 20))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching news: {e}")
+            return []
         
         if response.status_code == 200:
             data = response.json()
@@ -451,13 +789,10 @@ class ORBNewsTrader:
             logger.error(f"Failed to fetch news: {response.status_code} - {response.text[:200]}")
             return []
     
-    @with_timeout(30, {"sentiment": "Neutral", "related_companies": []})
     def analyze_article(self, text):
         """Analyze a news article using GPT to extract sentiment and companies"""
         # Truncate text to ensure it's not too long
-        max_length = 1000
-        if len(text) > max_length:
-            text = text[:max_length] + "..."
+        text = truncate_article(text)
         
         prompt = f"""
 You are a financial trading assistant. Given a news article, return a JSON object with:
@@ -478,59 +813,101 @@ Article:
 
         logger.info("Sending request to OpenAI API")
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
+        response = openai_client.with_options(timeout=20).chat.completions.create(
+            model=OPENAI_MODEL,
             messages=[
                 {"role": "system", "content": "You are a market-savvy financial assistant."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.3,
-            timeout=20  # Client timeout
+            response_format={"type": "json_object"},  # Response is always a single JSON object
+            temperature=0.3
         )
         
         content = response.choices[0].message.content
         logger.info(f"GPT response received")
         
-        # Extract JSON from response
-        start = content.find("{")
-        end = content.rfind("}") + 1
-        if start == -1 or end == 0:
-            logger.error(f"Invalid JSON format in GPT response")
-            return {"sentiment": "Neutral", "related_companies": []}
-            
-        json_blob = content[start:end]
-        parsed = json.loads(json_blob)
-        return parsed
+        return json.loads(content)
     
-    def match_company_to_symbol(self, company_name, symbols_to_check):
-        """Match company name to stock symbol"""
-        # Define common company name variations
-        company_aliases = {
-            "apple": "AAPL",
-            "microsoft": "MSFT",
-            "amazon": "AMZN",
-            "google": "GOOGL",
-            "alphabet": "GOOGL",
-            "meta": "META",
-            "facebook": "META",
-            "tesla": "TSLA",
-            "nvidia": "NVDA",
-            "amd": "AMD",
-            "advanced micro devices": "AMD",
-            "intel": "INTC",
-            "ibm": "IBM",
-            "international business machines": "IBM"
-        }
+    def analyze_articles(self, texts):
+        """
+        Analyze several news articles with a single GPT request
         
-        # Try direct lookup
-        company_lower = company_name.lower()
-        if company_lower in company_aliases:
-            symbol = company_aliases[company_lower]
-            if symbol in symbols_to_check:
-                return symbol
+        Falls back to one concurrent request per article if the batch request
+        fails or doesn't return exactly one result per article.
         
-        # No match found
-        return None
+        Args:
+            texts (list): Article texts
+            
+        Returns:
+            list: Analysis dict per article, None where the analysis failed
+        """
+        if not texts:
+            return []
+        
+        articles_text = "\n\n".join(
+            f"Article {i}:\n{truncate_article(text)}" for i, text in enumerate(texts)
+        )
+        
+        prompt = f"""
+You are a financial trading assistant. You are given {len(texts)} news articles, numbered from 0.
+For each article determine:
+
+1. Market sentiment: Bullish, Bearish, or Neutral
+2. A list of up to 3 major publicly traded companies affected. Return exact company names, not ticker symbols.
+   IMPORTANT: Only include companies that are publicly traded on stock exchanges.
+
+Return a JSON object with a "results" array of length {len(texts)}, where item i is the analysis of article i.
+
+Format:
+{{
+  "results": [
+    {{"sentiment": "Bullish", "related_companies": ["Apple", "Tesla"]}}
+  ]
+}}
+
+{articles_text}
+"""
+        
+        try:
+            logger.info(f"Sending batched request for {len(texts)} articles to OpenAI API")
+            
+            response = openai_client.with_options(timeout=60).chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are a market-savvy financial assistant."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            
+            results = json.loads(response.choices[0].message.content).get("results")
+            if isinstance(results, list) and len(results) == len(texts) and all(isinstance(r, dict) for r in results):
+                logger.info("GPT batch response received")
+                return results
+            
+            logger.warning(f"GPT batch response didn't contain {len(texts)} results, analyzing articles individually")
+        except Exception as e:
+            logger.error(f"Error in batched article analysis, analyzing articles individually: {e}")
+        
+        # Send the articles one per request, concurrently so the request latencies overlap
+        with ThreadPoolExecutor(max_workers=NEWS_ANALYSIS_WORKERS) as executor:
+            analysis_futures = [executor.submit(self.analyze_article, text) for text in texts]
+        
+        analyses = []
+        for analysis_future in analysis_futures:
+            try:
+                analyses.append(analysis_future.result())
+            except Exception as e:
+                logger.error(f"Error analyzing article: {e}")
+                analyses.append(None)
+        return analyses
+    
+    def match_company_to_symbol(self, company_name, symbols_to_check=SYMBOLS_SET):
+        """Match company name to stock symbol"""
+        # Direct lookup, None if there is no alias or the symbol isn't tracked
+        symbol = _COMPANY_ALIASES.get(company_name.casefold())
+        return symbol if symbol in symbols_to_check else None
     
     def process_news_data(self):
         """Process news data and update sentiment for symbols"""
@@ -546,16 +923,21 @@ Article:
             
             news_results = []
             
+            # Analyze all articles with GPT in one go
+            texts = [f"{article.get('title', 'Untitled article')} {article.get('content', '')}" for article in articles]
+            analyses = self.analyze_articles(texts)
+            
             # Process each article
-            for article in articles:
+            for article, analysis in zip(articles, analyses):
                 try:
                     # Process article
                     title = article.get('title', 'Untitled article')
                     logger.info(f"Processing: {title[:100]}...")
                     
-                    # Analyze with GPT
-                    full_text = f"{title} {article.get('content', '')}"
-                    analysis = self.analyze_article(full_text)
+                    # Skip articles whose analysis failed (already logged)
+                    if analysis is None:
+                        continue
+                    
                     sentiment = analysis.get("sentiment", "Neutral")
                     related_companies = analysis.get("related_companies", [])
                     
@@ -564,7 +946,7 @@ Article:
                     
                     # Match to symbols
                     for company in related_companies:
-                        symbol = self.match_company_to_symbol(company, SYMBOLS_TO_TRACK)
+                        symbol = self.match_company_to_symbol(company)
                         
                         if not symbol:
                             continue
@@ -573,7 +955,7 @@ Article:
                         
                         # Update sentiment for this symbol
                         if symbol not in self.news_sentiment:
-                            self.news_sentiment[symbol] = []
+                            self.news_sentiment[symbol] = deque(maxlen=MAX_SENTIMENT_ENTRIES)
                         
                         # Add the sentiment data
                         sentiment_data = {
@@ -583,10 +965,8 @@ Article:
                             "timestamp": datetime.datetime.now().isoformat()
                         }
                         
-                        # Keep only the 5 most recent sentiment entries
+                        # The deque keeps only the most recent sentiment entries
                         self.news_sentiment[symbol].append(sentiment_data)
-                        if len(self.news_sentiment[symbol]) > 5:
-                            self.news_sentiment[symbol] = self.news_sentiment[symbol][-5:]
                         
                         # Add to results
                         news_results.append({
@@ -596,9 +976,6 @@ Article:
                             "article_title": title
                         })
                     
-                except TimeoutError:
-                    logger.error(f"Timeout processing article: {title[:100]}")
-                    continue
                 except Exception as e:
                     logger.error(f"Error processing article: {e}")
                     continue
@@ -609,26 +986,28 @@ Article:
             logger.info(f"Processed {len(articles)} articles, updated sentiment for {len(news_results)} symbol-article pairs")
             return news_results
             
-        except TimeoutError:
-            logger.error("News processing timed out")
-            return []
         except Exception as e:
             logger.error(f"Error processing news data: {e}")
             return []
     
-    def get_combined_signal(self, symbol):
+    def get_combined_signal(self, symbol, price_data=None):
         """
         Combine ORB strategy signal with news sentiment to get final trading decision
         
+        Args:
+            symbol (str): Symbol to decide on
+            price_data (dict): Optional pre-fetched market data for the symbol
+        
         Returns: tuple (decision, confidence, data)
         """
         try:
             # Get ORB signal
-            orb_data = self.check_orb_signals(symbol)
+            orb_data = self.check_orb_signals(symbol, price_data=price_data)
             if not orb_data:
                 return ("HOLD", 0.5, {"reason": "No ORB data available"})
             
             orb_signal = orb_data["signal"]
+            orb_code = orb_data["signal_code"]
             
             # Get news sentiment
             sentiment_data = self.news_sentiment.get(symbol, [])
@@ -637,41 +1016,30 @@ Article:
             if not sentiment_data:
                 return (orb_signal, 0.6, {"reason": "Using ORB signal only (no news data)", "orb_data": orb_data})
             
-            # Calculate overall sentiment from recent news
-            sentiment_scores = {
-                "Bullish": 1.0,
-                "Neutral": 0.5,
-                "Bearish": 0.0
-            }
+            # Get sentiment scores from recent news
+            scores = np.fromiter(
+                (_SENT_MAP.get(item["sentiment"], 0.5) for item in sentiment_data),
+                dtype=np.float64,
+                count=len(sentiment_data)
+            )
             
-            # Get sentiment scores, weighting more recent news higher
-            scores = []
-            weights = []
-            for i, item in enumerate(sentiment_data):
-                score = sentiment_scores.get(item["sentiment"], 0.5)
-                
-                # More recent news gets higher weight
-                weight = 1.0 + (i * 0.2)  
-                
-                scores.append(score)
-                weights.append(weight)
+            # More recent news gets higher weight
+            weights = 1.0 + 0.2 * np.arange(len(scores))
             
             # Calculate weighted average sentiment
-            if sum(weights) > 0:
-                avg_sentiment = sum(s * w for s, w in zip(scores, weights)) / sum(weights)
-            else:
-                avg_sentiment = 0.5
+            avg_sentiment = float(scores @ weights / weights.sum())
             
             # Sentiment labels
             if avg_sentiment > 0.7:
                 sentiment_label = "Bullish"
-                sentiment_signal = "BUY"
+                sentiment_code = _SIG["BUY"]
             elif avg_sentiment < 0.3:
                 sentiment_label = "Bearish"
-                sentiment_signal = "SELL"
+                sentiment_code = _SIG["SELL"]
             else:
                 sentiment_label = "Neutral"
-                sentiment_signal = "HOLD"
+                sentiment_code = _SIG["HOLD"]
+            sentiment_signal = _SIG_INV[sentiment_code]
                 
             logger.info(f"Average sentiment for {symbol}: {avg_sentiment:.2f} ({sentiment_label})")
             
@@ -680,21 +1048,22 @@ Article:
             # If they disagree, use ORB signal but with lower confidence
             # If ORB is HOLD, but sentiment is strong, use sentiment with lower confidence
             
-            if orb_signal == sentiment_signal:
+            if orb_code == sentiment_code:
                 # Signals agree
-                confidence = 0.8 if orb_signal != "HOLD" else 0.6
+                confidence = 0.8 if orb_code else 0.6
                 reason = f"ORB and news sentiment both suggest {orb_signal}"
-                decision = orb_signal
-            elif orb_signal == "HOLD" and sentiment_signal != "HOLD":
+                decision_code = orb_code
+            elif not orb_code:
                 # ORB says HOLD but sentiment is strong
                 confidence = 0.6
                 reason = f"News sentiment suggests {sentiment_signal} while ORB indicates HOLD"
-                decision = sentiment_signal
+                decision_code = sentiment_code
             else:
                 # Signals disagree, prioritize ORB
                 confidence = 0.7
                 reason = f"ORB signal {orb_signal} overrides news sentiment {sentiment_signal}"
-                decision = orb_signal
+                decision_code = orb_code
+            decision = _SIG_INV[decision_code]
             
             return (decision, confidence, {
                 "reason": reason,
@@ -709,6 +1078,50 @@ Article:
             logger.error(f"Error generating combined signal for {symbol}: {e}")
             return ("HOLD", 0.5, {"reason": f"Error: {str(e)}"})
     
+    def process_symbol(self, symbol, account, positions_by_symbol=None, price_data=None, cycle_time=None):
+        """
+        Compute the combined signal for one symbol and execute or queue the trade
+        (run from the trading cycle thread pool)
+        
+        Args:
+            cycle_time (str): ISO timestamp of the trading cycle, shared by every
+                record the cycle writes. Defaults to now.
+        
+        Returns:
+            dict: Result record for the symbol, or None if skipped for time
+        """
+        # Leave remaining symbols for the next cycle once the time budget is spent
+        elapsed = time.monotonic() - self._cycle_start
+        if elapsed > CYCLE_TIME_BUDGET_SECONDS:
+            logger.warning(f"Skipping {symbol}: trading cycle time budget spent ({elapsed:.0f}s)")
+            return None
+        
+        if cycle_time is None:
+            cycle_time = datetime.datetime.now().isoformat()
+        
+        logger.info(f"Processing symbol: {symbol}")
+        
+        # Get combined signal (falls back to a single quote if price_data is missing)
+        decision, confidence, reason_data = self.get_combined_signal(symbol, price_data=price_data)
+        
+        logger.info(f"Decision for {symbol}: {decision} (confidence: {confidence:.2f})")
+        logger.info(f"Reason: {reason_data['reason']}")
+        
+        # Execute or queue trade
+        trade_result = self.execute_trade(symbol, decision, confidence, account, reason_data, positions_by_symbol, cycle_time, price_data)
+        
+        # Record result
+        return {
+            "symbol": symbol,
+            "decision": decision,
+            "confidence": confidence,
+            "reason": reason_data["reason"],
+            "trade_executed": trade_result["success"],
+            "message": trade_result["message"],
+            "queued": trade_result.get("queued", False),
+            "timestamp": cycle_time
+        }
+    
     def calculate_position_size(self, symbol, confidence, account):
         """Calculate position size based on portfolio value and confidence"""
         try:
@@ -731,8 +1144,18 @@ Article:
             logger.error(f"Error calculating position size: {e}")
             return 0
     
-    def execute_trade(self, symbol, decision, confidence, account, reason_data=None):
-        """Execute a trade based on the decision or queue it if market is closed"""
+    def execute_trade(self, symbol, decision, confidence, account, reason_data=None, positions_by_symbol=None, cycle_time=None, price_data=None):
+        """
+        Execute a trade based on the decision or queue it if market is closed
+        
+        Args:
+            positions_by_symbol (dict): Open positions fetched once per cycle, updated
+                in place after a buy or sell. Fetched from Alpaca if not given.
+            cycle_time (str): ISO timestamp of the trading cycle, saved with the
+                order details so orders can be matched to the cycle results
+            price_data (dict): Quote prefetched for the cycle, used to price a buy
+                without another request
+        """
         market_open = self.is_market_open()
         
         # Format reason data for logging
@@ -755,8 +1178,9 @@ Article:
                 if symbol in self.news_sentiment and self.news_sentiment[symbol]:
                     news_title = self.news_sentiment[symbol][-1].get("article_title")
             
-            # Queue the trade
-            queue_trade(symbol, decision, sentiment=sentiment_str, news_title=news_title)
+            # Queue the trade (the queue file is shared by all symbol threads)
+            with self._queue_lock:
+                queue_trade(symbol, decision, sentiment=sentiment_str, news_title=news_title)
             
             return {
                 "symbol": symbol,
@@ -786,13 +1210,17 @@ Article:
                 position_size = self.calculate_position_size(symbol, confidence, account)
                 
                 # Get current price
-                try:
-                    quote = alpaca.get_latest_quote(symbol)
-                    price = float(quote.ask_price)  # Use ask price for buying
-                except:
-                    # Fallback to last trade price
-                    bar = alpaca.get_latest_bar(symbol)
-                    price = float(bar.c)
+                price = self.get_buy_price(symbol, price_data)
+                if not price:
+                    logger.warning(f"No usable price for {symbol}, skipping buy")
+                    return {
+                        "symbol": symbol,
+                        "decision": decision,
+                        "success": False,
+                        "message": "No price available",
+                        "reason": reason,
+                        "queued": False
+                    }
                 
                 # Calculate quantity
                 quantity = int(position_size / price)
@@ -809,11 +1237,11 @@ Article:
                 
                 # Check if we already have this position
                 try:
-                    positions = alpaca.list_positions()
-                    current_positions = {p.symbol: p for p in positions}
+                    if positions_by_symbol is None:
+                        positions_by_symbol = {p.symbol: p for p in alpaca.list_positions()}
                     
-                    if symbol in current_positions:
-                        existing_position = current_positions[symbol]
+                    if symbol in positions_by_symbol:
+                        existing_position = positions_by_symbol[symbol]
                         logger.info(f"Already have position in {symbol}: {existing_position.qty} shares at ${float(existing_position.avg_entry_price):.2f}")
                         
                         return {
@@ -824,14 +1252,14 @@ Article:
                             "reason": reason,
                             "queued": False
                         }
-                except Exception as e:
+                except ALPACA_ERRORS as e:
                     logger.warning(f"Error checking existing positions: {e}")
                 
                 # Calculate stop loss and take profit prices
                 stop_loss_price = price * (1 - ORB_STOP_LOSS_PCT)
                 take_profit_price = price * (1 + ORB_PROFIT_TARGET_PCT)
                 
-                # Submit market order
+                # Submit market order with attached stop loss and take profit legs
                 logger.info(f"Buying {quantity} shares of {symbol} at ~${price:.2f}")
                 try:
                     order = alpaca.submit_order(
@@ -839,72 +1267,12 @@ Article:
                         qty=quantity,
                         side="buy",
                         type="market",
-                        time_in_force="day"
+                        time_in_force="day",
+                        order_class="bracket",
+                        stop_loss={"stop_price": round(stop_loss_price, 2)},
+                        take_profit={"limit_price": round(take_profit_price, 2)}
                     )
-                    
-                    # Save order details
-                    order_details = {
-                        "symbol": symbol,
-                        "order_id": order.id,
-                        "quantity": quantity,
-                        "price": price,
-                        "decision": decision,
-                        "confidence": confidence,
-                        "timestamp": datetime.datetime.now().isoformat(),
-                        "stop_loss": stop_loss_price,
-                        "take_profit": take_profit_price,
-                        "reason": reason
-                    }
-                    
-                    # Add stop loss and take profit orders
-                    try:
-                        # Wait for the main order to fill
-                        self.wait_for_order_fill(order.id)
-                        
-                        # Submit stop loss order
-                        stop_order = alpaca.submit_order(
-                            symbol=symbol,
-                            qty=quantity,
-                            side="sell",
-                            type="stop",
-                            time_in_force="day",
-                            stop_price=stop_loss_price
-                        )
-                        logger.info(f"Submitted stop loss order for {symbol} at ${stop_loss_price:.2f}")
-                        
-                        # Submit take profit order
-                        profit_order = alpaca.submit_order(
-                            symbol=symbol,
-                            qty=quantity,
-                            side="sell",
-                            type="limit",
-                            time_in_force="day",
-                            limit_price=take_profit_price
-                        )
-                        logger.info(f"Submitted take profit order for {symbol} at ${take_profit_price:.2f}")
-                        
-                        # Update order details
-                        order_details["stop_loss_order_id"] = stop_order.id
-                        order_details["take_profit_order_id"] = profit_order.id
-                    except Exception as e:
-                        logger.error(f"Error setting stop loss/take profit for {symbol}: {e}")
-                    
-                    # Save order to file
-                    self.save_order_details(order_details)
-                    
-                    return {
-                        "symbol": symbol,
-                        "decision": decision,
-                        "success": True,
-                        "message": f"Bought {quantity} shares at ~${price:.2f}",
-                        "order_id": order.id,
-                        "stop_loss": stop_loss_price,
-                        "take_profit": take_profit_price,
-                        "reason": reason,
-                        "queued": False
-                    }
-                    
-                except Exception as e:
+                except ALPACA_ERRORS as e:
                     logger.error(f"Error submitting buy order for {symbol}: {e}")
                     return {
                         "symbol": symbol,
@@ -915,6 +1283,51 @@ Article:
                         "queued": False
                     }
                 
+                logger.info(f"Submitted bracket order for {symbol} with stop loss at ${stop_loss_price:.2f} and take profit at ${take_profit_price:.2f}")
+                
+                # Save order details
+                order_details = {
+                    "symbol": symbol,
+                    "order_id": order.id,
+                    "quantity": quantity,
+                    "price": price,
+                    "decision": decision,
+                    "confidence": confidence,
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "cycle_time": cycle_time,
+                    "stop_loss": stop_loss_price,
+                    "take_profit": take_profit_price,
+                    "reason": reason
+                }
+                
+                # Record the stop loss and take profit leg order IDs
+                for leg in getattr(order, "legs", None) or []:
+                    if leg.type == "stop":
+                        order_details["stop_loss_order_id"] = leg.id
+                    elif leg.type == "limit":
+                        order_details["take_profit_order_id"] = leg.id
+                
+                # Save order to file
+                self.save_order_details(order_details)
+                
+                # Record the new position so the rest of the cycle sees it
+                if positions_by_symbol is not None:
+                    positions_by_symbol[symbol] = SimpleNamespace(
+                        symbol=symbol, qty=quantity, avg_entry_price=price
+                    )
+                
+                return {
+                    "symbol": symbol,
+                    "decision": decision,
+                    "success": True,
+                    "message": f"Bought {quantity} shares at ~${price:.2f}",
+                    "order_id": order.id,
+                    "stop_loss": stop_loss_price,
+                    "take_profit": take_profit_price,
+                    "reason": reason,
+                    "queued": False
+                }
+                
             elif decision == "SELL":
                 # Check if we have a position in this symbol
                 try:
@@ -930,32 +1343,7 @@ Article:
                         type="market",
                         time_in_force="day"
                     )
-                    
-                    # Save order details
-                    order_details = {
-                        "symbol": symbol,
-                        "order_id": order.id,
-                        "quantity": quantity,
-                        "price": float(position.current_price),
-                        "decision": decision,
-                        "confidence": confidence,
-                        "timestamp": datetime.datetime.now().isoformat(),
-                        "reason": reason
-                    }
-                    
-                    self.save_order_details(order_details)
-                    
-                    return {
-                        "symbol": symbol,
-                        "decision": decision,
-                        "success": True,
-                        "message": f"Sold {quantity} shares",
-                        "order_id": order.id,
-                        "reason": reason,
-                        "queued": False
-                    }
-                    
-                except Exception as e:
+                except ALPACA_ERRORS as e:
                     logger.error(f"Error selling {symbol}: {e}")
                     return {
                         "symbol": symbol,
@@ -965,6 +1353,34 @@ Article:
                         "reason": reason,
                         "queued": False
                     }
+                
+                # Save order details
+                order_details = {
+                    "symbol": symbol,
+                    "order_id": order.id,
+                    "quantity": quantity,
+                    "price": float(position.current_price),
+                    "decision": decision,
+                    "confidence": confidence,
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "cycle_time": cycle_time,
+                    "reason": reason
+                }
+                
+                self.save_order_details(order_details)
+                
+                if positions_by_symbol is not None:
+                    positions_by_symbol.pop(symbol, None)
+                
+                return {
+                    "symbol": symbol,
+                    "decision": decision,
+                    "success": True,
+                    "message": f"Sold {quantity} shares",
+                    "order_id": order.id,
+                    "reason": reason,
+                    "queued": False
+                }
             
             else:  # HOLD or other decision
                 logger.info(f"No action needed for {symbol} with decision: {decision}")
@@ -977,7 +1393,7 @@ Article:
                     "queued": False
                 }
         
-        except Exception as e:
+        except ALPACA_ERRORS as e:
             logger.error(f"Error executing trade for {symbol}: {e}")
             return {
                 "symbol": symbol,
@@ -987,52 +1403,71 @@ Article:
                 "reason": reason,
                 "queued": False
             }
+        except Exception as e:
+            logger.exception(f"Unexpected error executing trade for {symbol}: {e}")
+            return {
+                "symbol": symbol,
+                "decision": decision,
+                "success": False,
+                "message": f"Error: {e}",
+                "reason": reason,
+                "queued": False
+            }
     
-    def wait_for_order_fill(self, order_id, timeout=60):
-        """Wait for an order to be filled, with timeout"""
-        start_time = time.time()
+    def save_order_details(self, order_details):
+        """Queue order details to be saved to file for record keeping"""
+        # Create filename with timestamp and symbol (taken now, not when written)
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        symbol = order_details["symbol"]
+        filename = f"data/orders/{timestamp}_{symbol}_{order_details['decision']}.json"
         
-        while (time.time() - start_time) < timeout:
+        with self._persist_lock:
+            if self._persist_thread is None:
+                self._persist_thread = threading.Thread(target=self.persist_worker, name="order-persist", daemon=True)
+                self._persist_thread.start()
+            self._persist_q.put((filename, order_details))
+    
+    def persist_worker(self):
+        """Write queued order details to disk (runs on a daemon thread until it gets None)"""
+        while True:
+            item = self._persist_q.get()
+            if item is None:
+                self._persist_q.task_done()
+                break
+            
+            filename, order_details = item
             try:
-                order = alpaca.get_order(order_id)
-                if order.status == "filled":
-                    return order
-                elif order.status == "rejected" or order.status == "canceled":
-                    logger.warning(f"Order {order_id} was {order.status}")
-                    return order
-                    
-                # Wait a bit before checking again
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"Error checking order status: {e}")
-                return None
+                # Write to a temp file (data/orders is created once at import) and swap it in so a crash can't leave a partial file
+                tmp_filename = f"{filename}.tmp"
+                Path(tmp_filename).write_bytes(dump_json_bytes(order_details))
+                os.replace(tmp_filename, filename)
                 
-        logger.warning(f"Timeout waiting for order {order_id} to fill")
-        return None
-    
-    def save_order_details(self, order_details):
-        """Save order details to file for record keeping"""
-        try:
-            # Ensure directory exists
-            Path("data/orders").mkdir(exist_ok=True)
-            
-            # Create filename with timestamp and symbol
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            symbol = order_details["symbol"]
-            filename = f"data/orders/{timestamp}_{symbol}_{order_details['decision']}.json"
-            
-            # Save to file
-            with open(filename, "w") as f:
-                json.dump(order_details, f, indent=2)
+                logger.info(f"Saved order details to {filename}")
                 
-            logger.info(f"Saved order details to {filename}")
+            except Exception as e:
+                logger.error(f"Error saving order details: {e}")
+            finally:
+                self._persist_q.task_done()
+    
+    def flush_order_details(self):
+        """Block until all queued order details have been written, then stop the writer thread"""
+        with self._persist_lock:
+            if self._persist_thread is None:
+                return
             
-        except Exception as e:
-            logger.error(f"Error saving order details: {e}")
+            self._persist_q.join()
+            self._persist_q.put(None)
+            self._persist_thread.join()
+            self._persist_thread = None
     
     def run_trading_cycle(self):
         """Run a complete trading cycle"""
         logger.info("Starting trading cycle")
+        self._cycle_start = time.monotonic()
+        
+        # One timestamp for everything this cycle records
+        cycle_start = datetime.datetime.now()
+        cycle_time = cycle_start.isoformat()
         
         results = []
         
@@ -1055,49 +1490,47 @@ Article:
             logger.info(f"Cash balance: ${float(account.cash):.2f}")
             logger.info(f"Portfolio value: ${float(account.portfolio_value):.2f}")
             
+            # Get open positions once for the whole cycle
+            try:
+                positions_by_symbol = {p.symbol: p for p in alpaca.list_positions()}
+            except Exception as e:
+                logger.warning(f"Error getting open positions, checking per trade: {e}")
+                positions_by_symbol = None
+            
             # Process news data first (this also saves state)
             self.process_news_data()
             
-            # Calculate opening ranges if not done yet
-            for symbol in SYMBOLS_TO_TRACK:
-                if symbol not in self.orb_ranges:
-                    self.calculate_opening_range(symbol)
+            # Calculate opening ranges if not done yet, fetching bars for all
+            # missing symbols in one request
+            pending_symbols = [symbol for symbol in SYMBOLS_TO_TRACK if symbol not in self.orb_ranges]
+            if pending_symbols:
+                self.calculate_opening_ranges(pending_symbols)
+            
+            # Quote every symbol in one request
+            market_data = self.get_current_market_data_batch(SYMBOLS_TO_TRACK)
+            
+            # Process all symbols concurrently, the work is mostly waiting on Alpaca.
+            # Each result goes in its symbol's slot so results stay in SYMBOLS_TO_TRACK order.
+            symbol_results = [None] * len(SYMBOLS_TO_TRACK)
+            with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(SYMBOLS_TO_TRACK))) as executor:
+                futures = {
+                    executor.submit(self.process_symbol, symbol, account, positions_by_symbol, market_data.get(symbol), cycle_time): idx
+                    for idx, symbol in enumerate(SYMBOLS_TO_TRACK)
+                }
+                
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    try:
+                        symbol_results[idx] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing symbol {SYMBOLS_TO_TRACK[idx]}: {e}")
             
-            # Process each symbol
-            for symbol in SYMBOLS_TO_TRACK:
-                try:
-                    logger.info(f"Processing symbol: {symbol}")
-                    
-                    # Get combined signal
-                    decision, confidence, reason_data = self.get_combined_signal(symbol)
-                    
-                    logger.info(f"Decision for {symbol}: {decision} (confidence: {confidence:.2f})")
-                    logger.info(f"Reason: {reason_data['reason']}")
-                    
-                    # Execute or queue trade
-                    trade_result = self.execute_trade(symbol, decision, confidence, account, reason_data)
-                    
-                    # Record result
-                    result = {
-                        "symbol": symbol,
-                        "decision": decision,
-                        "confidence": confidence,
-                        "reason": reason_data["reason"],
-                        "trade_executed": trade_result["success"],
-                        "message": trade_result["message"],
-                        "queued": trade_result.get("queued", False),
-                        "timestamp": datetime.datetime.now().isoformat()
-                    }
-                    
-                    results.append(result)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing symbol {symbol}: {e}")
-                    continue
+            # Drop symbols that failed or were skipped
+            results = [result for result in symbol_results if result is not None]
             
             # Save final results
             try:
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = cycle_start.strftime("%Y%m%d_%H%M%S")
                 
                 # Get updated account info
                 account = alpaca.get_account()
@@ -1107,12 +1540,11 @@ Article:
                     'positions_value': float(account.portfolio_value) - float(account.cash)
                 }
                 
-                with open(f"data/trading_results_{timestamp}.json", "w") as f:
-                    json.dump({
-                        "timestamp": datetime.datetime.now().isoformat(),
-                        "portfolio_value": portfolio_value,
-                        "results": results
-                    }, f, indent=2)
+                Path(f"data/trading_results_{timestamp}.json").write_bytes(dump_json_bytes({
+                    "timestamp": cycle_time,
+                    "portfolio_value": portfolio_value,
+                    "results": results
+                }))
                 
                 logger.info("Results saved to file")
             except Exception as e:
@@ -1129,6 +1561,10 @@ Article:
         except Exception as e:
             logger.error(f"Error in trading cycle: {e}")
             return results
+        
+        finally:
+            # Make sure every order is on disk before the process can exit
+            self.flush_order_details()
 
 def main():
     """Main function for the trading bot"""
@@ -3,8 +3,11 @@
 
 import os
 import sys
+import json
 import time
+import signal
 import logging
+import threading
 import datetime
 import importlib
 from pathlib import Path
@@ -12,26 +15,10 @@ import pytz
 import alpaca_trade_api as tradeapi
 from dotenv import load_dotenv
 
-# Configure logging with UTF-8 encoding
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("windows_scheduler.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Logging is configured by _setup_logging() when the scheduler starts, so importing
+# this module doesn't open windows_scheduler.log or print anything
 logger = logging.getLogger('windows_scheduler')
 
-# Import timezone utilities
-try:
-    from timezone_utils import get_eastern_time, get_current_market_period, log_current_time
-    TIMEZONE_UTILS_AVAILABLE = True
-    logger.info("Timezone utilities loaded successfully")
-except ImportError:
-    TIMEZONE_UTILS_AVAILABLE = False
-    logger.warning("Timezone utilities not available, using built-in timezone functions")
-
 # Load environment variables
 load_dotenv()
 
@@ -48,21 +35,23 @@ alpaca = tradeapi.REST(
     api_version='v2'
 )
 
-# Import timezone utilities
+# Import timezone utilities (reported by _setup_logging())
 try:
-    from timezone_utils import get_eastern_time, get_current_market_period, log_current_time
+    from timezone_utils import (
+        get_eastern_time, get_current_market_period, log_current_time,
+        get_clock_cached, effective_interval_seconds
+    )
     TIMEZONE_UTILS_AVAILABLE = True
-    logger.info("Timezone utilities loaded successfully")
 except ImportError:
     TIMEZONE_UTILS_AVAILABLE = False
-    logger.warning("Timezone utilities not available, using built-in timezone functions")
 
 # Configuration
 CONFIG = {
     "trading_bot_module": "windows_trader",  # Python module name (without .py)
     "trading_bot_function": "main",          # Function to run in the module
     "max_retries": 3,                        # Max retries on failure
-    "retry_delay_seconds": 60,               # Delay between retries
+    "retry_initial_delay_seconds": 5,        # Delay before the first retry (doubles each retry)
+    "retry_delay_seconds": 60,               # Maximum delay between retries
     
     # Check intervals in minutes based on market periods
     "check_intervals": {
@@ -78,8 +67,63 @@ CONFIG = {
     }
 }
 
-# Flag to control the scheduler
-running = True
+# Timezones looked up once at import
+_UTC = pytz.UTC
+_EASTERN = pytz.timezone('US/Eastern')
+
+# Market calendar is cached on disk and the clock in memory, both change rarely
+CALENDAR_CACHE_FILE = "data/calendar_cache.json"
+CALENDAR_CACHE_HOURS = 24
+CLOCK_CACHE_SECONDS = 30
+
+# In-memory caches: (fetched at, value)
+_calendar_cache = None
+_clock_cache = (0.0, None)
+
+# Set once the data directories have been created
+_DIRS_READY = False
+
+# Last bot run time, read from data/last_run.txt once and then kept in memory
+LAST_RUN_FILE = "data/last_run.txt"
+_last_run = None
+_last_run_loaded = False
+
+# Trades queued from news while the market was closed (written by trade_queue).
+# The file only changes when the bot runs, so the pending count is re-read after
+# each run rather than on every scheduler tick.
+QUEUE_FILE = "data/trade_queue.json"
+_queued_trade_count = None
+
+# Set when the scheduler has been asked to stop
+stop_event = threading.Event()
+
+# Longest single wait on stop_event; Event.wait() cannot be interrupted by Ctrl+C on Windows
+STOP_POLL_SECONDS = 1
+
+def _setup_logging():
+    """
+    Configure logging with UTF-8 encoding and log which timezone functions are in use
+    
+    File and console writes are done by a background thread so the scheduler loop
+    never blocks on disk. An existing logging configuration is left alone.
+    """
+    try:
+        from logging_utils import setup_queue_logging
+        setup_queue_logging("windows_scheduler.log")
+    except ImportError:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler("windows_scheduler.log", encoding='utf-8'),
+                logging.StreamHandler()
+            ]
+        )
+    
+    if TIMEZONE_UTILS_AVAILABLE:
+        logger.info("Timezone utilities loaded successfully")
+    else:
+        logger.warning("Timezone utilities not available, using built-in timezone functions")
 
 def get_eastern_time():
     """Get current time in US Eastern Time (ET), which is the timezone for US markets"""
@@ -87,37 +131,149 @@ def get_eastern_time():
         # Use the imported function
         from timezone_utils import get_eastern_time as get_et
         et_time = get_et()
-        logger.debug(f"Using timezone_utils.get_eastern_time(): {et_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Using timezone_utils.get_eastern_time(): %s", et_time.strftime('%Y-%m-%d %H:%M:%S %Z'))
         return et_time
     else:
         # Fallback implementation
-        utc_now = datetime.datetime.now(pytz.UTC)
-        eastern = pytz.timezone('US/Eastern')
-        eastern_time = utc_now.astimezone(eastern)
+        utc_now = datetime.datetime.now(_UTC)
+        eastern_time = utc_now.astimezone(_EASTERN)
         
         # Log for debugging
         is_dst = eastern_time.dst() != datetime.timedelta(0)
-        logger.debug(f"Fallback timezone calculation:")
-        logger.debug(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        logger.debug(f"Eastern time: {eastern_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        logger.debug(f"Is DST active: {is_dst}")
+        logger.debug("Fallback timezone calculation:")
+        logger.debug("UTC time: %s", utc_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+        logger.debug("Eastern time: %s", eastern_time.strftime('%Y-%m-%d %H:%M:%S %Z'))
+        logger.debug("Is DST active: %s", is_dst)
         
         return eastern_time
 
+def ensure_data_dirs():
+    """Create the data directories once per process"""
+    global _DIRS_READY
+    
+    if not _DIRS_READY:
+        Path("data/orders").mkdir(parents=True, exist_ok=True)
+        Path("data/orb_data").mkdir(exist_ok=True)
+        _DIRS_READY = True
+
+def get_clock():
+    """Get the Alpaca market clock, reusing the last answer for CLOCK_CACHE_SECONDS"""
+    global _clock_cache
+    
+    if TIMEZONE_UTILS_AVAILABLE:
+        return get_clock_cached(alpaca)
+    
+    # Fallback implementation
+    checked_at, clock = _clock_cache
+    now = time.monotonic()
+    if clock is not None and now - checked_at < CLOCK_CACHE_SECONDS:
+        return clock
+    
+    clock = alpaca.get_clock()
+    _clock_cache = (now, clock)
+    return clock
+
+def refresh_queued_trade_count():
+    """Re-read the number of pending BUY/SELL trades in the trade queue (HOLD entries don't count)"""
+    global _queued_trade_count
+    
+    try:
+        with open(QUEUE_FILE, "r") as f:
+            queue = json.load(f)
+        _queued_trade_count = sum(1 for trade in queue if trade.get("decision") in ("BUY", "SELL"))
+    except (OSError, ValueError, AttributeError):
+        _queued_trade_count = 0
+    
+    return _queued_trade_count
+
+def get_queued_trade_count():
+    """Get the number of pending BUY/SELL trades in the trade queue, as of the last bot run"""
+    if _queued_trade_count is None:
+        return refresh_queued_trade_count()
+    return _queued_trade_count
+
+def get_check_interval_seconds(period):
+    """
+    Get the time to wait before the next check
+    
+    Starts from the period's configured interval and, when timezone_utils is
+    available, widens it while the market is closed with nothing queued and
+    tightens it just before the open or close.
+    
+    Args:
+        period (str): Current market period key
+        
+    Returns:
+        float: Seconds to wait
+    """
+    interval_minutes = CONFIG["check_intervals"][period]
+    if not TIMEZONE_UTILS_AVAILABLE:
+        return interval_minutes * 60
+    
+    try:
+        clock = get_clock()
+    except Exception as e:
+        logger.warning("Could not get market clock for the check interval: %s", e)
+        clock = None
+    
+    return effective_interval_seconds(clock, get_queued_trade_count(), interval_minutes)
+
+def get_trading_dates():
+    """
+    Get the set of trading dates from the Alpaca calendar
+    
+    The calendar is cached in CALENDAR_CACHE_FILE and only fetched again once
+    the cache is older than CALENDAR_CACHE_HOURS.
+    
+    Returns:
+        set: Trading dates as ISO strings (YYYY-MM-DD)
+    """
+    global _calendar_cache
+    
+    now = datetime.datetime.now()
+    max_age = datetime.timedelta(hours=CALENDAR_CACHE_HOURS)
+    
+    # Load the disk cache the first time
+    if _calendar_cache is None:
+        cache_file = Path(CALENDAR_CACHE_FILE)
+        if cache_file.exists():
+            try:
+                with open(cache_file, "r") as f:
+                    cached = json.load(f)
+                _calendar_cache = (datetime.datetime.fromisoformat(cached["fetched_at"]), set(cached["dates"]))
+            except Exception as e:
+                logger.warning("Ignoring unreadable calendar cache: %s", e)
+    
+    if _calendar_cache is not None and now - _calendar_cache[0] < max_age:
+        return _calendar_cache[1]
+    
+    # Fetch the calendar and save it for the next day's checks (and restarts)
+    trading_dates = {day.date.isoformat() for day in alpaca.get_calendar()}
+    _calendar_cache = (now, trading_dates)
+    try:
+        ensure_data_dirs()
+        with open(CALENDAR_CACHE_FILE, "w") as f:
+            json.dump({"fetched_at": now.isoformat(), "dates": sorted(trading_dates)}, f)
+    except Exception as e:
+        logger.warning("Could not save calendar cache: %s", e)
+    
+    return trading_dates
+
 def is_market_open():
     """Check if the market is currently open using Alpaca API"""
     try:
-        clock = alpaca.get_clock()
+        clock = get_clock()
         is_open = clock.is_open
         
         # Log current time for debugging
         et_now = get_eastern_time()
-        logger.debug(f"Current ET time: {et_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        logger.debug(f"Market is {'open' if is_open else 'closed'}")
+        logger.debug("Current ET time: %s", et_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+        logger.debug("Market is %s", 'open' if is_open else 'closed')
         
         return is_open
     except Exception as e:
-        logger.error(f"Error checking market hours: {e}")
+        logger.error("Error checking market hours: %s", e)
         # Default to closed if we can't check
         return False
 
@@ -128,24 +284,22 @@ def is_trading_day():
     
     # Check if it's a weekend in ET
     if et_now.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-        logger.info(f"Not a trading day: It's {et_now.strftime('%A')} in ET")
+        logger.info("Not a trading day: It's %s in ET", et_now.strftime('%A'))
         return False
     
     # Check if it's a market holiday using Alpaca's calendar
     try:
-        calendar = alpaca.get_calendar()
         today = et_now.date().isoformat()
         
-        for day in calendar:
-            if day.date.isoformat() == today:
-                logger.info(f"Today ({today}) is a trading day according to Alpaca calendar")
-                return True
+        if today in get_trading_dates():
+            logger.info("Today (%s) is a trading day according to Alpaca calendar", today)
+            return True
         
         # If today is not in the calendar, it's a holiday
-        logger.info(f"Today ({today}) is not a trading day according to Alpaca calendar (likely a holiday)")
+        logger.info("Today (%s) is not a trading day according to Alpaca calendar (likely a holiday)", today)
         return False
     except Exception as e:
-        logger.error(f"Error checking if today is a trading day: {e}")
+        logger.error("Error checking if today is a trading day: %s", e)
         # Default to True for weekdays if we can't check
         return et_now.weekday() < 5
 
@@ -155,7 +309,7 @@ def get_current_market_period():
         # Use the imported function
         from timezone_utils import get_current_market_period as get_period
         period_key, period_name, interval = get_period()
-        logger.debug(f"Using timezone_utils: Current period: {period_key} ({period_name})")
+        logger.debug("Using timezone_utils: Current period: %s (%s)", period_key, period_name)
         return period_key
     else:
         # Fallback implementation
@@ -164,28 +318,59 @@ def get_current_market_period():
         et_hour = et_now.hour
         et_minute = et_now.minute
         
-        logger.debug(f"Fallback market period calculation:")
-        logger.debug(f"Current ET hour: {et_hour}, minute: {et_minute}")
+        logger.debug("Fallback market period calculation:")
+        logger.debug("Current ET hour: %s, minute: %s", et_hour, et_minute)
+        
+        # All period boundaries fall on the half hour
+        return PERIOD_BY_HALF_HOUR[et_hour * 2 + et_minute // 30]
+
+def resolve_market_period(et_hour, et_minute):
+    """Map an Eastern Time hour and minute to its market period"""
+    if 4 <= et_hour < 9 or (et_hour == 9 and et_minute < 30):
+        return "pre_market"
+    elif (et_hour == 9 and et_minute >= 30) or (et_hour == 10 and et_minute < 30):
+        return "market_open"
+    elif (et_hour == 10 and et_minute >= 30) or (et_hour == 11):
+        return "morning"
+    elif 12 <= et_hour < 14:
+        return "midday"
+    elif 14 <= et_hour < 15:
+        return "afternoon"
+    elif 15 <= et_hour < 16:
+        return "power_hour"
+    elif 16 <= et_hour < 20:
+        return "after_hours"
+    elif 20 <= et_hour < 24:
+        return "evening"
+    else:  # 0 <= et_hour < 4
+        return "overnight"
+
+# Market period for each half hour of the day, indexed by hour * 2 + minute // 30
+PERIOD_BY_HALF_HOUR = tuple(
+    resolve_market_period(slot // 2, (slot % 2) * 30) for slot in range(48)
+)
+
+def get_seconds_until_next_period(et_now):
+    """
+    Get the number of seconds until the market period after the current one starts
+    
+    Args:
+        et_now (datetime): Current Eastern Time
         
-        # Determine the period based on time
-        if 4 <= et_hour < 9 or (et_hour == 9 and et_minute < 30):
-            return "pre_market"
-        elif (et_hour == 9 and et_minute >= 30) or (et_hour == 10 and et_minute < 30):
-            return "market_open"
-        elif (et_hour == 10 and et_minute >= 30) or (et_hour == 11):
-            return "morning"
-        elif 12 <= et_hour < 14:
-            return "midday"
-        elif 14 <= et_hour < 15:
-            return "afternoon"
-        elif 15 <= et_hour < 16:
-            return "power_hour"
-        elif 16 <= et_hour < 20:
-            return "after_hours"
-        elif 20 <= et_hour < 24:
-            return "evening"
-        else:  # 0 <= et_hour < 4
-            return "overnight"
+    Returns:
+        float: Seconds until the next period boundary (at least 1)
+    """
+    slot = et_now.hour * 2 + et_now.minute // 30
+    period = PERIOD_BY_HALF_HOUR[slot]
+    
+    # Time left in the current half hour, then whole half hours of the same period
+    seconds = (30 - et_now.minute % 30) * 60 - et_now.second - et_now.microsecond / 1e6
+    for step in range(1, 48):
+        if PERIOD_BY_HALF_HOUR[(slot + step) % 48] != period:
+            break
+        seconds += 30 * 60
+    
+    return max(seconds, 1)
 
 def should_run_now():
     """Determine if the bot should run now based on time and preferred intervals"""
@@ -206,62 +391,97 @@ def should_run_now():
                           abs((current_minute + 60) % 60 - pref_min))
         
         if min_distance <= 1:
-            logger.info(f"Running at a preferred interval (minute {current_minute}, near {pref_min})")
+            logger.info("Running at a preferred interval (minute %s, near %s)", current_minute, pref_min)
             return True
     
     # If we're not at a preferred minute, check if enough time has passed since last run
-    last_run_file = Path("data/last_run.txt")
-    if last_run_file.exists():
-        try:
-            with open(last_run_file, "r") as f:
-                last_run_str = f.read().strip()
-                last_run = datetime.datetime.fromisoformat(last_run_str)
-                now = datetime.datetime.now()
-                minutes_since_last_run = (now - last_run).total_seconds() / 60
-                
-                # Get the appropriate interval based on current time
-                period = get_current_market_period()
-                appropriate_interval = CONFIG["check_intervals"][period]
-                
-                # Get current Eastern Time for debugging
-                et_now = get_eastern_time()
-                
-                logger.info(f"Current time (ET): {et_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-                logger.info(f"Current period: {period}, interval: {appropriate_interval} minutes")
-                logger.info(f"Minutes since last run: {minutes_since_last_run:.2f}")
-                
-                if minutes_since_last_run < appropriate_interval:
-                    logger.info(f"Not enough time since last run, skipping")
-                    return False
-        except Exception as e:
-            logger.error(f"Error reading last run time: {e}")
-            # If there's an error reading the last run time, proceed with execution
-            return True
+    last_run = get_last_run_time()
+    if last_run is not None:
+        now = datetime.datetime.now()
+        minutes_since_last_run = (now - last_run).total_seconds() / 60
+        
+        # Get the appropriate interval based on current time
+        period = get_current_market_period()
+        appropriate_interval = CONFIG["check_intervals"][period]
+        
+        # Get current Eastern Time for debugging
+        et_now = get_eastern_time()
+        
+        logger.info("Current time (ET): %s", et_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+        logger.info("Current period: %s, interval: %s minutes", period, appropriate_interval)
+        logger.info("Minutes since last run: %.2f", minutes_since_last_run)
+        
+        if minutes_since_last_run < appropriate_interval:
+            logger.info("Not enough time since last run, skipping")
+            return False
     
     return True
 
+def get_last_run_time():
+    """
+    Get the time of the last bot run
+    
+    The file is only read the first time, afterwards the in-memory value
+    kept up to date by update_last_run_time() is used.
+    
+    Returns:
+        datetime: Local time of the last run, or None if unknown
+    """
+    global _last_run, _last_run_loaded
+    
+    if not _last_run_loaded:
+        _last_run_loaded = True
+        last_run_file = Path(LAST_RUN_FILE)
+        if last_run_file.exists():
+            try:
+                with open(last_run_file, "r") as f:
+                    _last_run = datetime.datetime.fromisoformat(f.read().strip())
+            except Exception as e:
+                # If there's an error reading the last run time, proceed with execution
+                logger.error("Error reading last run time: %s", e)
+    
+    return _last_run
+
 def update_last_run_time():
     """Update the timestamp of the last bot run"""
-    Path("data").mkdir(exist_ok=True)
+    global _last_run, _last_run_loaded
+    
     now = datetime.datetime.now()
+    _last_run = now
+    _last_run_loaded = True
+    
+    # Still write it to disk so a restarted scheduler knows about it
+    ensure_data_dirs()
     try:
-        with open("data/last_run.txt", "w") as f:
+        with open(LAST_RUN_FILE, "w") as f:
             f.write(now.isoformat())
-        logger.info(f"Updated last run time to {now.isoformat()}")
+        logger.info("Updated last run time to %s", now.isoformat())
     except Exception as e:
-        logger.error(f"Error updating last run time: {e}")
+        logger.error("Error updating last run time: %s", e)
 
-def run_trading_bot():
-    """Run the trading bot module"""
+def load_trading_bot():
+    """
+    Import the trading bot module and look up its entry point
+    
+    Returns:
+        callable: The configured trading bot function
+    """
+    # Import the trading bot module
+    bot_module = importlib.import_module(CONFIG["trading_bot_module"])
+    
+    # Get the main function
+    return getattr(bot_module, CONFIG["trading_bot_function"])
+
+def run_trading_bot(main_function):
+    """
+    Run the trading bot
+    
+    Args:
+        main_function (callable): Trading bot entry point from load_trading_bot()
+    """
     try:
-        # Import the trading bot module
-        bot_module = importlib.import_module(CONFIG["trading_bot_module"])
-        
-        # Get the main function
-        main_function = getattr(bot_module, CONFIG["trading_bot_function"])
-        
         # Run the bot
-        logger.info(f"Running trading bot: {CONFIG['trading_bot_module']}.{CONFIG['trading_bot_function']}()")
+        logger.info("Running trading bot: %s.%s()", CONFIG['trading_bot_module'], CONFIG['trading_bot_function'])
         result = main_function()
         
         # Update the last run time
@@ -269,29 +489,41 @@ def run_trading_bot():
         
         return result
     except Exception as e:
-        logger.error(f"Error running trading bot: {e}")
+        logger.error("Error running trading bot: %s", e)
         return None
 
 def run_with_retries():
-    """Run the trading bot with retries on failure"""
+    """Run the trading bot with retries on failure, backing off exponentially between attempts"""
+    retry_delay = CONFIG["retry_initial_delay_seconds"]
+    
+    # Resolve the entry point once, a missing module or function won't fix itself between retries
+    try:
+        main_function = load_trading_bot()
+    except (ImportError, AttributeError) as e:
+        logger.error("Error loading trading bot %s.%s(): %s", CONFIG['trading_bot_module'], CONFIG['trading_bot_function'], e)
+        return False
+    
     for attempt in range(CONFIG["max_retries"]):
         try:
-            result = run_trading_bot()
+            result = run_trading_bot(main_function)
             
             if result is not None:
                 logger.info("Trading bot run successful")
                 return True
             
-            logger.warning(f"Trading bot returned None (attempt {attempt+1}/{CONFIG['max_retries']})")
+            logger.warning("Trading bot returned None (attempt %s/%s)", attempt+1, CONFIG['max_retries'])
         except Exception as e:
-            logger.error(f"Error in trading bot (attempt {attempt+1}/{CONFIG['max_retries']}): {e}")
+            logger.error("Error in trading bot (attempt %s/%s): %s", attempt+1, CONFIG['max_retries'], e)
         
         # Don't delay on the last attempt
         if attempt < CONFIG["max_retries"] - 1:
-            logger.info(f"Waiting {CONFIG['retry_delay_seconds']} seconds before retrying...")
-            time.sleep(CONFIG['retry_delay_seconds'])
+            logger.info("Waiting %s seconds before retrying...", retry_delay)
+            if wait_for_stop(retry_delay):
+                logger.info("Stop requested, abandoning remaining retries")
+                return False
+            retry_delay = min(retry_delay * 2, CONFIG["retry_delay_seconds"])
     
-    logger.error(f"Trading bot failed after {CONFIG['max_retries']} attempts")
+    logger.error("Trading bot failed after %s attempts", CONFIG['max_retries'])
     return False
 
 def log_status():
@@ -303,11 +535,11 @@ def log_status():
     appropriate_interval = CONFIG["check_intervals"][current_period]
     
     logger.info("=== System Status ===")
-    logger.info(f"Current time: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info(f"Current ET time: {et_now.strftime('%Y-%m-%d %H:%M:%S %Z')} (DST active: {et_now.dst() != datetime.timedelta(0)})")
-    logger.info(f"Market is {'open' if market_open else 'closed'}")
-    logger.info(f"Today is {'a trading day' if trading_day else 'not a trading day'}")
-    logger.info(f"Current period: {current_period}, check interval: {appropriate_interval} minutes")
+    logger.info("Current time: %s", datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info("Current ET time: %s (DST active: %s)", et_now.strftime('%Y-%m-%d %H:%M:%S %Z'), et_now.dst() != datetime.timedelta(0))
+    logger.info("Market is %s", 'open' if market_open else 'closed')
+    logger.info("Today is %s", 'a trading day' if trading_day else 'not a trading day')
+    logger.info("Current period: %s, check interval: %s minutes", current_period, appropriate_interval)
     
     # Check portfolio status if market is open
     if market_open:
@@ -315,77 +547,42 @@ def log_status():
             account = alpaca.get_account()
             positions = alpaca.list_positions()
             
-            logger.info(f"Portfolio value: ${float(account.portfolio_value):.2f}")
-            logger.info(f"Cash balance: ${float(account.cash):.2f}")
-            logger.info(f"Number of positions: {len(positions)}")
+            logger.info("Portfolio value: $%.2f", float(account.portfolio_value))
+            logger.info("Cash balance: $%.2f", float(account.cash))
+            logger.info("Number of positions: %s", len(positions))
         except Exception as e:
-            logger.error(f"Error getting portfolio status: {e}")
-
-def test_timezone():
-    """Test timezone functionality to validate settings"""
-    logger.info("=== Testing Timezone Settings ===")
-    
-    # Get current time in various timezones
-    utc_now = datetime.datetime.now(pytz.UTC)
-    eastern = pytz.timezone('US/Eastern')
-    et_now = utc_now.astimezone(eastern)
-    local_now = datetime.datetime.now()
-    
-    # Log times for debugging
-    logger.info(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.info(f"ET time via direct conversion: {et_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    
-    # Test our get_eastern_time function
-    function_et = get_eastern_time()
-    logger.info(f"ET time via get_eastern_time(): {function_et.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    
-    # Validate that both methods return the same hour
-    if et_now.hour != function_et.hour:
-        logger.error(f"TIMEZONE ERROR: ET hours don't match! Direct: {et_now.hour}, Function: {function_et.hour}")
-    else:
-        logger.info(f"Timezone validation successful: ET hour is {et_now.hour}")
-    
-    # Check DST status
-    is_dst = et_now.dst() != datetime.timedelta(0)
-    logger.info(f"Is DST active: {is_dst}")
-    
-    # Test market period detection
-    period = get_current_market_period()
-    logger.info(f"Current market period: {period}")
-    
-    return et_now
+            logger.error("Error getting portfolio status: %s", e)
 
 def test_timezone():
     """Test timezone functionality to validate settings"""
     logger.info("=== Testing Timezone Settings ===")
     
     # Get current time in various timezones
-    utc_now = datetime.datetime.now(pytz.UTC)
-    eastern = pytz.timezone('US/Eastern')
-    et_now = utc_now.astimezone(eastern)
+    utc_now = datetime.datetime.now(_UTC)
+    et_now = utc_now.astimezone(_EASTERN)
     local_now = datetime.datetime.now()
     
     # Log times for debugging
-    logger.info(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.info(f"ET time via direct conversion: {et_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+    logger.info("UTC time: %s", utc_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+    logger.info("ET time via direct conversion: %s", et_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
     
     # Test our get_eastern_time function
     function_et = get_eastern_time()
-    logger.info(f"ET time via get_eastern_time(): {function_et.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+    logger.info("ET time via get_eastern_time(): %s", function_et.strftime('%Y-%m-%d %H:%M:%S %Z'))
     
     # Validate that both methods return the same hour
     if et_now.hour != function_et.hour:
-        logger.error(f"TIMEZONE ERROR: ET hours don't match! Direct: {et_now.hour}, Function: {function_et.hour}")
+        logger.error("TIMEZONE ERROR: ET hours don't match! Direct: %s, Function: %s", et_now.hour, function_et.hour)
     else:
-        logger.info(f"Timezone validation successful: ET hour is {et_now.hour}")
+        logger.info("Timezone validation successful: ET hour is %s", et_now.hour)
     
     # Check DST status
     is_dst = et_now.dst() != datetime.timedelta(0)
-    logger.info(f"Is DST active: {is_dst}")
+    logger.info("Is DST active: %s", is_dst)
     
     # Test market period detection
     period = get_current_market_period()
-    logger.info(f"Current market period: {period}")
+    logger.info("Current market period: %s", period)
     
     return et_now
 
@@ -409,7 +606,7 @@ def check_api_keys_before_market():
             if not results["success"]:
                 logger.error("API key verification failed before market open:")
                 for error in results["errors"]:
-                    logger.error(f"  - {error}")
+                    logger.error("  - %s", error)
                 
                 # Check if OpenAI API specifically failed
                 if "openai" in results["details"] and not results["details"]["openai"]["success"]:
@@ -423,16 +620,47 @@ def check_api_keys_before_market():
         except ImportError:
             logger.error("Could not import verify_api_keys function from windows_trader")
         except Exception as e:
-            logger.error(f"Error checking API keys before market: {e}")
+            logger.error("Error checking API keys before market: %s", e)
+
+def wait_for_stop(seconds):
+    """
+    Wait up to the given number of seconds, returning early if a stop is requested
+    
+    Returns:
+        bool: True if the scheduler has been asked to stop
+    """
+    deadline = time.monotonic() + seconds
+    remaining = seconds
+    
+    while remaining > 0:
+        if stop_event.wait(min(remaining, STOP_POLL_SECONDS)):
+            return True
+        remaining = deadline - time.monotonic()
+    
+    return stop_event.is_set()
+
+def handle_stop_signal(signum, frame):
+    """Stop the scheduler gracefully when asked to by a supervising process"""
+    logger.info("Received stop signal %s, stopping scheduler", signum)
+    stop_event.set()
+
+def install_signal_handlers():
+    """Install graceful-shutdown handlers for the signals a supervisor may send"""
+    # CTRL_BREAK_EVENT is delivered as SIGBREAK to a process started in its own
+    # process group on Windows (CTRL_C_EVENT cannot reach such a group)
+    if hasattr(signal, "SIGBREAK"):
+        signal.signal(signal.SIGBREAK, handle_stop_signal)
+    signal.signal(signal.SIGTERM, handle_stop_signal)
 
 def main_loop():
     """Main scheduler loop"""
-    global running
+    _setup_logging()
+    
+    # Allow a supervisor to stop the scheduler without killing it mid-run
+    install_signal_handlers()
     
     # Create data directory if it doesn't exist
-    Path("data").mkdir(exist_ok=True)
-    Path("data/orders").mkdir(exist_ok=True)
-    Path("data/orb_data").mkdir(exist_ok=True)
+    ensure_data_dirs()
     
     # Test timezone functionality first
     test_timezone()
@@ -444,10 +672,10 @@ def main_loop():
     print("Scheduler running... Press Ctrl+C to stop")
     
     try:
-        # Set running flag
-        running = True
+        # Clear any earlier stop request
+        stop_event.clear()
         
-        while running:
+        while not stop_event.is_set():
             try:
                 # Log current status
                 log_status()
@@ -459,33 +687,40 @@ def main_loop():
                 if should_run_now():
                     logger.info("Running trading bot")
                     run_with_retries()
+                    # The run may have queued or processed trades
+                    refresh_queued_trade_count()
                 else:
                     logger.info("Skipping run based on schedule")
                 
                 # Calculate time until next check
                 period = get_current_market_period()
-                next_check_minutes = CONFIG["check_intervals"][period]
+                wait_seconds = get_check_interval_seconds(period)
                 
-                logger.info(f"Waiting {next_check_minutes} minutes until next check")
+                # Don't sleep past the start of the next period (e.g. market open)
+                seconds_to_next_period = get_seconds_until_next_period(get_eastern_time())
+                if seconds_to_next_period < wait_seconds:
+                    wait_seconds = seconds_to_next_period
+                    logger.info("Waiting %.1f minutes until the next market period starts", wait_seconds / 60)
+                else:
+                    logger.info("Waiting %.1f minutes until next check", wait_seconds / 60)
                 
-                # Wait in a way that allows for keyboard interrupt
-                for _ in range(next_check_minutes * 60):
-                    if not running:
-                        break
-                    time.sleep(1)
+                # Wait in a way that allows for keyboard interrupt and stop signals
+                if wait_for_stop(wait_seconds):
+                    break
                 
             except KeyboardInterrupt:
                 logger.info("Keyboard interrupt received, stopping scheduler")
-                running = False
+                stop_event.set()
                 break
             except Exception as e:
-                logger.error(f"Error in scheduler loop: {e}")
+                logger.error("Error in scheduler loop: %s", e)
                 # Wait a minute before trying again
-                time.sleep(60)
+                if wait_for_stop(60):
+                    break
     
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received, stopping scheduler")
-        running = False
+        stop_event.set()
     
     logger.info("Scheduler stopped")
 
@@ -496,5 +731,5 @@ if __name__ == "__main__":
         logger.info("Keyboard interrupt received, stopping scheduler")
         print("Scheduler stopped by user")
     except Exception as e:
-        logger.error(f"Unhandled error in scheduler: {e}")
+        logger.error("Unhandled error in scheduler: %s", e)
         raise
\ No newline at end of file
@@ -2,13 +2,18 @@
 # Windows-compatible ORB trading bot with no Unix-specific functions
 
 import os
+import re
 import sys
 import time
 import json
+import sqlite3
+import hashlib
 import logging
 import datetime
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from dotenv import load_dotenv
 from openai import OpenAI
@@ -16,21 +21,27 @@ import alpaca_trade_api as tradeapi
 import pandas as pd
 import pytz
 import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging with UTF-8 encoding
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("windows_trader.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# File and console writes are done by a background thread so the trading loop never blocks on disk
+try:
+    from logging_utils import setup_queue_logging
+    setup_queue_logging("windows_trader.log")
+except ImportError:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("windows_trader.log", encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
 logger = logging.getLogger('windows_trader')
 
 # Try to import timezone utilities
 try:
-    from timezone_utils import get_eastern_time, log_current_time
+    from timezone_utils import get_eastern_time, log_current_time, get_clock_cached
     TIMEZONE_UTILS_AVAILABLE = True
     logger.info("Timezone utilities loaded successfully")
     # Log current timezone info for debugging
@@ -39,6 +50,9 @@ except ImportError:
     TIMEZONE_UTILS_AVAILABLE = False
     logger.warning("Timezone utilities not available, using built-in timezone functions")
 
+# JSON and article helpers shared with the other trader (orjson is used when installed)
+from trader_utils import truncate_article, dump_json_bytes, load_json_bytes
+
 # Load environment variables
 load_dotenv()
 
@@ -61,6 +75,15 @@ alpaca = tradeapi.REST(
     api_version='v2'
 )
 
+# Shared keep-alive session for News API requests, so repeated requests skip the
+# TCP/TLS handshake. Transient failures and rate limits are retried with backoff.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+))
+
 # Create necessary directories
 Path("data").mkdir(exist_ok=True)
 Path("data/orders").mkdir(exist_ok=True)
@@ -69,6 +92,12 @@ Path("data/orb_data").mkdir(exist_ok=True)
 # Configuration
 SYMBOLS_TO_TRACK = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "AMD", "INTC", "IBM"]
 MAX_POSITION_PCT = 0.1  # Maximum 10% of portfolio in one position
+NEWS_ANALYSIS_WORKERS = 8  # Concurrent OpenAI requests when analyzing news articles
+MARKET_DATA_WORKERS = 8  # Concurrent Yahoo Finance requests when fetching prices
+ORDER_POLL_INITIAL_SECONDS = 0.1  # First order status poll interval
+ORDER_POLL_MAX_SECONDS = 2.0  # Poll interval cap
+ANALYSIS_CACHE_FILE = "data/analysis_cache.db"  # GPT analyses of articles already seen
+ACCOUNT_CACHE_SECONDS = 5  # How long account and position reads are reused
 
 # ORB Strategy Configuration
 ORB_TIMEFRAME = 15  # Opening range in minutes (usually 15 or 30)
@@ -78,6 +107,67 @@ ORB_STOP_LOSS_PCT = 0.005  # Stop loss at 0.5%
 MARKET_OPEN_HOUR = 9
 MARKET_OPEN_MINUTE = 30
 
+# Yahoo Finance (period, interval) to request for each bar timeframe
+YF_TIMEFRAMES = {
+    "1Min": ("2d", "1m"),  # Get more data since we'll filter
+    "5Min": ("5d", "5m"),
+    "15Min": ("5d", "15m")
+}
+YF_DEFAULT_TIMEFRAME = ("1mo", "1h")
+
+# One yf.Ticker per symbol for the life of the process, so the timezone and other
+# metadata a Ticker looks up on first use are only fetched once
+TICKERS = {symbol: yf.Ticker(symbol) for symbol in SYMBOLS_TO_TRACK}
+
+def get_ticker(symbol):
+    """Get the shared yf.Ticker for a symbol"""
+    ticker = TICKERS.get(symbol)
+    if ticker is None:
+        ticker = TICKERS.setdefault(symbol, yf.Ticker(symbol))
+    return ticker
+
+# Common company name variations (and tickers, which news text often uses on its own)
+COMPANY_ALIASES = {
+    "aapl": "AAPL",
+    "msft": "MSFT",
+    "amzn": "AMZN",
+    "googl": "GOOGL",
+    "tsla": "TSLA",
+    "nvda": "NVDA",
+    "intc": "INTC",
+    "apple": "AAPL",
+    "microsoft": "MSFT",
+    "amazon": "AMZN",
+    "google": "GOOGL",
+    "alphabet": "GOOGL",
+    "meta": "META",
+    "facebook": "META",
+    "tesla": "TSLA",
+    "nvidia": "NVDA",
+    "amd": "AMD",
+    "advanced micro devices": "AMD",
+    "intel": "INTC",
+    "ibm": "IBM",
+    "international business machines": "IBM"
+}
+
+# Regex matching any company alias as a whole word, longest alias first
+ALIAS_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(COMPANY_ALIASES, key=len, reverse=True))) + r")\b",
+    re.IGNORECASE
+)
+
+# Use an Aho-Corasick automaton to find every company alias in a text in one pass if available
+try:
+    import ahocorasick
+    ALIAS_AUTOMATON = ahocorasick.Automaton()
+    for alias, alias_symbol in COMPANY_ALIASES.items():
+        ALIAS_AUTOMATON.add_word(alias, (alias, alias_symbol))
+    ALIAS_AUTOMATON.make_automaton()
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Check if trade queue module is available
 try:
     from trade_queue import queue_trade, process_queue
@@ -87,6 +177,59 @@ except ImportError:
     QUEUE_AVAILABLE = False
     logger.warning("Trade queue module not found, trades won't be queued outside market hours")
 
+# Last account and positions reads: (monotonic time, value)
+_account_cache = (0.0, None)
+_positions_cache = (0.0, None)
+
+def get_account():
+    """Get the Alpaca account, reusing a read from the last ACCOUNT_CACHE_SECONDS"""
+    global _account_cache
+    fetched_at, account = _account_cache
+    if account is None or time.monotonic() - fetched_at > ACCOUNT_CACHE_SECONDS:
+        account = alpaca.get_account()
+        _account_cache = (time.monotonic(), account)
+    return account
+
+def get_positions():
+    """Get open Alpaca positions, reusing a read from the last ACCOUNT_CACHE_SECONDS"""
+    global _positions_cache
+    fetched_at, positions = _positions_cache
+    if positions is None or time.monotonic() - fetched_at > ACCOUNT_CACHE_SECONDS:
+        positions = alpaca.list_positions()
+        _positions_cache = (time.monotonic(), positions)
+    return positions
+
+def invalidate_account_cache():
+    """Forget cached account and positions reads (call after submitting an order)"""
+    global _account_cache, _positions_cache
+    _account_cache = (0.0, None)
+    _positions_cache = (0.0, None)
+
+def find_alias_symbols(text_lower):
+    """
+    Find the symbols of all company aliases mentioned in a text
+    
+    Args:
+        text_lower (str): Lower-cased text to scan
+        
+    Returns:
+        set: Symbols whose aliases appear in the text as whole words
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return {COMPANY_ALIASES[alias.lower()] for alias in ALIAS_RE.findall(text_lower)}
+    
+    symbols = set()
+    for end, (alias, symbol) in ALIAS_AUTOMATON.iter(text_lower):
+        start = end - len(alias) + 1
+        # Whole words only, so "amd" doesn't match inside "amdocs"
+        if (start == 0 or not text_lower[start - 1].isalnum()) and (end + 1 == len(text_lower) or not text_lower[end + 1].isalnum()):
+            symbols.add(symbol)
+    return symbols
+
+def get_analysis_cache_key(text_lower):
+    """Hash lower-cased article text for the analysis cache, ignoring surrounding whitespace"""
+    return hashlib.sha256(text_lower.strip().encode("utf-8")).hexdigest()
+
 class ORBNewsTrader:
     """Trading bot that combines ORB strategy with news sentiment analysis"""
     
@@ -95,6 +238,13 @@ class ORBNewsTrader:
         self.orb_ranges = {}  # Store ORB ranges for symbols
         self.orb_signals = {}  # Store current ORB signals
         self.news_sentiment = {}  # Store news sentiment for symbols
+        self.bars_cache = {}  # Bars fetched this cycle, by (symbol, timeframe)
+        
+        # GPT analyses are cached on disk so syndicated and repeated articles skip
+        # the OpenAI request. The connection is shared by the analysis threads.
+        self.analysis_cache = sqlite3.connect(ANALYSIS_CACHE_FILE, check_same_thread=False)
+        self.analysis_cache.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT)")
+        self.analysis_cache_lock = threading.Lock()
         
         # Load previous state if exists
         self.load_state()
@@ -104,13 +254,12 @@ class ORBNewsTrader:
         state_file = Path("data/orb_state.json")
         if state_file.exists():
             try:
-                with open(state_file, "r") as f:
-                    state = json.load(f)
-                    self.orb_ranges = state.get("orb_ranges", {})
-                    self.news_sentiment = state.get("news_sentiment", {})
-                logger.info(f"Loaded previous state with {len(self.orb_ranges)} ORB ranges")
+                state = load_json_bytes(state_file.read_bytes())
+                self.orb_ranges = state.get("orb_ranges", {})
+                self.news_sentiment = state.get("news_sentiment", {})
+                logger.info("Loaded previous state with %s ORB ranges", len(self.orb_ranges))
             except Exception as e:
-                logger.error(f"Error loading state: {e}")
+                logger.error("Error loading state: %s", e)
     
     def save_state(self):
         """Save current trading state"""
@@ -120,11 +269,13 @@ class ORBNewsTrader:
                 "news_sentiment": self.news_sentiment,
                 "last_updated": datetime.datetime.now().isoformat()
             }
-            with open("data/orb_state.json", "w") as f:
-                json.dump(state, f, indent=2)
+            # Write to a temp file and swap it in so a crash can't leave a partial file
+            tmp_file = Path("data/orb_state.json.tmp")
+            tmp_file.write_bytes(dump_json_bytes(state))
+            os.replace(tmp_file, "data/orb_state.json")
             logger.info("Saved current trading state")
         except Exception as e:
-            logger.error(f"Error saving state: {e}")
+            logger.error("Error saving state: %s", e)
     
     def get_eastern_time(self):
         """Get current time in US Eastern Time"""
@@ -132,7 +283,8 @@ class ORBNewsTrader:
             # Use the imported function
             from timezone_utils import get_eastern_time as get_et
             et_time = get_et()
-            logger.debug(f"Using timezone_utils.get_eastern_time(): {et_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using timezone_utils.get_eastern_time(): %s", et_time.strftime('%Y-%m-%d %H:%M:%S %Z'))
             return et_time
         else:
             # Fallback implementation
@@ -142,85 +294,131 @@ class ORBNewsTrader:
             
             # Log for debugging
             is_dst = et_time.dst() != datetime.timedelta(0)
-            logger.debug(f"Fallback timezone calculation in trader:")
-            logger.debug(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-            logger.debug(f"Eastern time: {et_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-            logger.debug(f"Is DST active: {is_dst}")
+            logger.debug("Fallback timezone calculation in trader:")
+            logger.debug("UTC time: %s", utc_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+            logger.debug("Eastern time: %s", et_time.strftime('%Y-%m-%d %H:%M:%S %Z'))
+            logger.debug("Is DST active: %s", is_dst)
             
             return et_time
     
     def is_market_open(self):
         """Check if the market is currently open"""
         try:
-            clock = alpaca.get_clock()
+            # The open/closed answer is stable for minutes, so reuse it when we can
+            clock = get_clock_cached(alpaca) if TIMEZONE_UTILS_AVAILABLE else alpaca.get_clock()
             return clock.is_open
         except Exception as e:
-            logger.error(f"Error checking market hours: {e}")
+            logger.error("Error checking market hours: %s", e)
             return False
     
+    def format_bars(self, df, limit):
+        """Format Yahoo Finance bars similar to Alpaca's format, in Eastern Time"""
+        # Clean up and format similar to Alpaca's format
+        df.index.name = 'timestamp'
+        df = df.rename(columns={
+            'Open': 'open',
+            'High': 'high',
+            'Low': 'low',
+            'Close': 'close',
+            'Volume': 'volume'
+        })
+        
+        # Limit the number of rows
+        if limit and len(df) > limit:
+            df = df.tail(limit)
+            
+        # Convert to Eastern Time if not already
+        if df.index.tz != pytz.timezone('America/New_York'):
+            try:
+                df = df.tz_convert('America/New_York')
+            except:
+                # If timezone conversion fails, set it directly
+                df = df.tz_localize('America/New_York', ambiguous='infer')
+        
+        return df
+    
     def fetch_historical_bars(self, symbol, timeframe="15Min", limit=100):
-        """Fetch historical bars for a symbol using Yahoo Finance"""
+        """Fetch historical bars for a symbol using Yahoo Finance (cached for the cycle)"""
+        cache_key = (symbol, timeframe)
+        if cache_key in self.bars_cache:
+            df = self.bars_cache[cache_key]
+            return df.tail(limit) if df is not None and limit else df
+        
         try:
-            # Define timeframe parameters for Yahoo Finance
-            if timeframe == "1Min":
-                period = "2d"  # Get more data since we'll filter
-                interval = "1m"
-            elif timeframe == "5Min":
-                period = "5d"
-                interval = "5m"
-            elif timeframe == "15Min":
-                period = "5d"
-                interval = "15m"
-            else:
-                period = "1mo"
-                interval = "1h"
+            period, interval = YF_TIMEFRAMES.get(timeframe, YF_DEFAULT_TIMEFRAME)
             
             # Fetch data from Yahoo Finance
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=period, interval=interval)
+            df = get_ticker(symbol).history(period=period, interval=interval)
             
             if df.empty:
-                logger.warning(f"No historical data found for {symbol}")
-                return None
-            
-            # Clean up and format similar to Alpaca's format
-            df.index.name = 'timestamp'
-            df = df.rename(columns={
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Volume': 'volume'
-            })
+                logger.warning("No historical data found for %s", symbol)
+                df = None
+            else:
+                df = self.format_bars(df, limit)
             
-            # Limit the number of rows
-            if limit and len(df) > limit:
-                df = df.tail(limit)
-                
-            # Convert to Eastern Time if not already
-            if df.index.tz != pytz.timezone('America/New_York'):
-                try:
-                    df = df.tz_convert('America/New_York')
-                except:
-                    # If timezone conversion fails, set it directly
-                    df = df.tz_localize('America/New_York', ambiguous='infer')
-                
+            self.bars_cache[cache_key] = df
             return df
             
         except Exception as e:
-            logger.error(f"Error fetching bars for {symbol} from Yahoo Finance: {e}")
+            logger.error("Error fetching bars for %s from Yahoo Finance: %s", symbol, e)
             return None
     
+    def fetch_historical_bars_batch(self, symbols, timeframe="15Min", limit=100):
+        """
+        Fetch historical bars for several symbols with one Yahoo Finance download
+        and cache them for the cycle, so fetch_historical_bars() doesn't hit the
+        network again for these symbols
+        
+        Args:
+            symbols (list): Symbols to fetch
+            timeframe (str): Bar timeframe, e.g. "1Min"
+            limit (int): Maximum number of bars to keep per symbol
+        """
+        if len(symbols) < 2:
+            # A single ticker download has a different column layout, nothing to batch anyway
+            for symbol in symbols:
+                self.fetch_historical_bars(symbol, timeframe=timeframe, limit=limit)
+            return
+        
+        try:
+            period, interval = YF_TIMEFRAMES.get(timeframe, YF_DEFAULT_TIMEFRAME)
+            
+            # One request for all symbols; auto_adjust matches Ticker.history()
+            data = yf.download(
+                tickers=list(symbols),
+                period=period,
+                interval=interval,
+                group_by='ticker',
+                auto_adjust=True,
+                threads=True,
+                progress=False
+            )
+            
+            for symbol in symbols:
+                if symbol not in data.columns.get_level_values(0):
+                    logger.warning("No historical data found for %s", symbol)
+                    self.bars_cache[(symbol, timeframe)] = None
+                    continue
+                
+                df = data[symbol].dropna(how='all')
+                if df.empty:
+                    logger.warning("No historical data found for %s", symbol)
+                    self.bars_cache[(symbol, timeframe)] = None
+                else:
+                    self.bars_cache[(symbol, timeframe)] = self.format_bars(df, limit)
+                    
+        except Exception as e:
+            # Leave the cache alone so the symbols are fetched one at a time
+            logger.error("Error fetching bars for %s from Yahoo Finance: %s", ', '.join(symbols), e)
+    
     def get_current_market_data(self, symbol):
         """Get current market data for a symbol using Yahoo Finance"""
         try:
-            ticker = yf.Ticker(symbol)
-            
             # Get current price data
-            current = ticker.history(period="1d")
+            current = get_ticker(symbol).history(period="1d")
             
             if current.empty:
-                logger.warning(f"No data available for {symbol}")
+                logger.warning("No data available for %s", symbol)
                 return None
             
             last_price = current["Close"].iloc[-1]
@@ -235,9 +433,57 @@ class ORBNewsTrader:
                 "timestamp": datetime.datetime.now().isoformat()
             }
         except Exception as e:
-            logger.error(f"Error getting market data for {symbol} from Yahoo Finance: {e}")
+            logger.error("Error getting market data for %s from Yahoo Finance: %s", symbol, e)
             return None
     
+    def get_current_market_data_batch(self, symbols):
+        """
+        Get current market data for several symbols with one Yahoo Finance download
+        
+        Falls back to fetching the symbols concurrently one by one if the download fails.
+        
+        Args:
+            symbols (list): Symbols to fetch
+            
+        Returns:
+            dict: Market data per symbol, in the same format as get_current_market_data().
+                Symbols without data are left out.
+        """
+        if len(symbols) > 1:
+            try:
+                data = yf.download(
+                    tickers=list(symbols),
+                    period="1d",
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False
+                )
+                
+                # Last close of every symbol at once (columns are symbols), then the
+                # approximate bid/ask the same way get_current_market_data() does
+                last_prices = data["Close"].ffill().iloc[-1].dropna()
+                bids = (last_prices * 0.999).to_dict()
+                asks = (last_prices * 1.001).to_dict()
+                timestamp = datetime.datetime.now().isoformat()
+                
+                return {
+                    symbol: {
+                        "symbol": symbol,
+                        "bid": bids[symbol],
+                        "ask": asks[symbol],
+                        "mid": mid,
+                        "timestamp": timestamp
+                    }
+                    for symbol, mid in last_prices.to_dict().items()
+                }
+            except Exception as e:
+                logger.error("Error downloading market data from Yahoo Finance, fetching symbols one by one: %s", e)
+        
+        with ThreadPoolExecutor(max_workers=min(MARKET_DATA_WORKERS, len(symbols))) as executor:
+            market_data = dict(zip(symbols, executor.map(self.get_current_market_data, symbols)))
+        
+        return {symbol: data for symbol, data in market_data.items() if data}
+    
     def calculate_opening_range(self, symbol):
         """
         Calculate the opening range for a symbol
@@ -252,7 +498,7 @@ class ORBNewsTrader:
             if symbol in self.orb_ranges:
                 orb_date = self.orb_ranges[symbol].get("date")
                 if orb_date == et_now.strftime("%Y-%m-%d"):
-                    logger.info(f"Using existing opening range for {symbol}")
+                    logger.info("Using existing opening range for %s", symbol)
                     return self.orb_ranges[symbol]
             
             # Try to get 1-minute bars first
@@ -301,7 +547,7 @@ class ORBNewsTrader:
                 
                 # If we couldn't find 1-minute data, try 5-minute bars as fallback
                 if not found_valid_data:
-                    logger.info(f"Trying 5-minute bars for {symbol} on {test_date_str}")
+                    logger.info("Trying 5-minute bars for %s on %s", symbol, test_date_str)
                     bars_5min = self.fetch_historical_bars(symbol, timeframe="5Min", limit=100)
                     
                     if bars_5min is not None and not isinstance(bars_5min, bool) and len(bars_5min) > 0:
@@ -316,7 +562,7 @@ class ORBNewsTrader:
                             break
             
             if not found_valid_data or opening_bars is None or len(opening_bars) == 0:
-                logger.warning(f"Could not find opening range data for {symbol} in past week")
+                logger.warning("Could not find opening range data for %s in past week", symbol)
                 return None
             
             # Calculate high and low of opening range
@@ -344,11 +590,11 @@ class ORBNewsTrader:
             # Save ORB data to file
             self.save_orb_data(symbol, orb_data, opening_bars)
             
-            logger.info(f"Calculated opening range for {symbol}: high=${opening_high:.2f}, low=${opening_low:.2f}")
+            logger.info("Calculated opening range for %s: high=$%.2f, low=$%.2f", symbol, opening_high, opening_low)
             return orb_data
             
         except Exception as e:
-            logger.error(f"Error calculating opening range for {symbol}: {e}")
+            logger.error("Error calculating opening range for %s: %s", symbol, e)
             return None
     
     def save_orb_data(self, symbol, orb_data, opening_bars):
@@ -356,31 +602,37 @@ class ORBNewsTrader:
         try:
             # Save the summary data
             date_str = orb_data["date"].replace("-", "")
-            with open(f"data/orb_data/{symbol}_{date_str}_orb.json", "w") as f:
-                json.dump(orb_data, f, indent=2)
+            Path(f"data/orb_data/{symbol}_{date_str}_orb.json").write_bytes(dump_json_bytes(orb_data))
             
             # Save the opening range bars to CSV
             if opening_bars is not None and not opening_bars.empty:
                 opening_bars.to_csv(f"data/orb_data/{symbol}_{date_str}_orb_bars.csv")
                 
         except Exception as e:
-            logger.error(f"Error saving ORB data for {symbol}: {e}")
+            logger.error("Error saving ORB data for %s: %s", symbol, e)
     
-    def check_orb_signals(self, symbol):
-        """Check for ORB breakout signals"""
+    def check_orb_signals(self, symbol, price_data=None):
+        """
+        Check for ORB breakout signals
+        
+        Args:
+            symbol (str): Symbol to check
+            price_data (dict): Prefetched market data, fetched here if not given
+        """
         try:
             # First, make sure we have the opening range calculated
             orb_range = self.orb_ranges.get(symbol)
             if not orb_range:
                 orb_range = self.calculate_opening_range(symbol)
                 if not orb_range:
-                    logger.warning(f"Cannot check ORB signals for {symbol} without opening range")
+                    logger.warning("Cannot check ORB signals for %s without opening range", symbol)
                     return None
             
             # Get current price data
-            price_data = self.get_current_market_data(symbol)
+            if price_data is None:
+                price_data = self.get_current_market_data(symbol)
             if not price_data:
-                logger.warning(f"Cannot check ORB signals for {symbol} without current price")
+                logger.warning("Cannot check ORB signals for %s without current price", symbol)
                 return None
             
             current_price = price_data["mid"]
@@ -397,13 +649,13 @@ class ORBNewsTrader:
             signal = None
             if current_price > high_breakout:
                 signal = "BUY"  # Bullish breakout
-                logger.info(f"ORB BUY signal for {symbol}: price ${current_price:.2f} > high breakout ${high_breakout:.2f}")
+                logger.info("ORB BUY signal for %s: price $%.2f > high breakout $%.2f", symbol, current_price, high_breakout)
             elif current_price < low_breakout:
                 signal = "SELL"  # Bearish breakout
-                logger.info(f"ORB SELL signal for {symbol}: price ${current_price:.2f} < low breakout ${low_breakout:.2f}")
+                logger.info("ORB SELL signal for %s: price $%.2f < low breakout $%.2f", symbol, current_price, low_breakout)
             else:
                 signal = "HOLD"  # No breakout
-                logger.info(f"No ORB breakout for {symbol}: price ${current_price:.2f} within range")
+                logger.info("No ORB breakout for %s: price $%.2f within range", symbol, current_price)
             
             # Create signal data
             signal_data = {
@@ -424,25 +676,24 @@ class ORBNewsTrader:
             return signal_data
             
         except Exception as e:
-            logger.error(f"Error checking ORB signals for {symbol}: {e}")
+            logger.error("Error checking ORB signals for %s: %s", symbol, e)
             return None
     
     def fetch_news_articles(self, symbols, max_results=5):
-        """Fetch news articles about the given symbols (with no timeouts)"""
+        """Fetch news articles about the given symbols"""
         # Create a query string with all symbols
         query = " OR ".join([symbol for symbol in symbols[:5]])  # Limit to 5 symbols to avoid long queries
         url = f"https://newsapi.org/v2/everything?q={query}&language=en&sortBy=publishedAt&pageSize={max_results}&apiKey={NEWS_API_KEY}"
 
-        logger.info(f"Fetching news with query: {query}")
+        logger.info("Fetching news with query: %s", query)
         
         try:
-            # Simple request with no timeout mechanism
-            response = requests.get(url)
+            response = SESSION.get(url, timeout=30)
             
             if response.status_code == 200:
-                data = response.json()
+                data = load_json_bytes(response.content)
                 articles = data.get('articles', [])
-                logger.info(f"Received {len(articles)} articles from News API")
+                logger.info("Received %s articles from News API", len(articles))
                 
                 # Process articles - filter out non-English articles to avoid the encoding issues
                 processed_articles = []
@@ -467,24 +718,54 @@ class ORBNewsTrader:
                     except UnicodeEncodeError:
                         # Skip articles with non-ASCII titles
                         safe_title = ''.join(char for char in title[:20] if ord(char) < 128)
-                        logger.info(f"Skipping non-English article: {safe_title}...")
+                        logger.info("Skipping non-English article: %s...", safe_title)
                         continue
                     
-                logger.info(f"Processed {len(processed_articles)} English articles")
+                logger.info("Processed %s English articles", len(processed_articles))
                 return processed_articles
             else:
-                logger.error(f"Failed to fetch news: {response.status_code} - {response.text[:200]}")
+                logger.error("Failed to fetch news: %s - %s", response.status_code, response.text[:200])
                 return []
         except Exception as e:
-            logger.error(f"Error fetching news articles: {e}")
+            logger.error("Error fetching news articles: %s", e)
             return []
     
-    def analyze_article(self, text):
+    def get_cached_analysis(self, cache_key):
+        """Return the cached GPT analysis for a get_analysis_cache_key() key, or None if there is none"""
+        try:
+            with self.analysis_cache_lock:
+                row = self.analysis_cache.execute(
+                    "SELECT value FROM cache WHERE key = ?", (cache_key,)
+                ).fetchone()
+            return load_json_bytes(row[0]) if row else None
+        except Exception as e:
+            logger.warning("Error reading analysis cache: %s", e)
+            return None
+    
+    def cache_analysis(self, cache_key, analysis):
+        """Store the GPT analysis of an article under its get_analysis_cache_key() key"""
+        try:
+            with self.analysis_cache_lock:
+                with self.analysis_cache:
+                    self.analysis_cache.execute(
+                        "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                        (cache_key, json.dumps(analysis))
+                    )
+        except Exception as e:
+            logger.warning("Error writing analysis cache: %s", e)
+    
+    def analyze_article(self, text, cache_key=None):
         """Analyze a news article using GPT to extract sentiment and companies (no timeout)"""
+        if cache_key is None:
+            cache_key = get_analysis_cache_key(text.lower())
+        
+        cached = self.get_cached_analysis(cache_key)
+        if cached is not None:
+            logger.info("Using cached GPT analysis")
+            return cached
+        
         # Truncate text to ensure it's not too long
-        max_length = 1000
-        if len(text) > max_length:
-            text = text[:max_length] + "..."
+        text = truncate_article(text)
         
         prompt = f"""
 You are a financial trading assistant. Given a news article, return a JSON object with:
@@ -512,51 +793,133 @@ Article:
                     {"role": "system", "content": "You are a market-savvy financial assistant."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                # JSON mode guarantees the whole reply is one JSON object
+                response_format={"type": "json_object"}
             )
             
             content = response.choices[0].message.content
-            logger.info(f"GPT response received")
-            
-            # Extract JSON from response
-            start = content.find("{")
-            end = content.rfind("}") + 1
-            if start == -1 or end == 0:
-                logger.error(f"Invalid JSON format in GPT response")
-                return {"sentiment": "Neutral", "related_companies": []}
-                
-            json_blob = content[start:end]
-            parsed = json.loads(json_blob)
+            logger.info("GPT response received")
+            
+            parsed = load_json_bytes(content)
+            
+            # Only successful analyses are cached, errors fall back to Neutral uncached
+            self.cache_analysis(cache_key, parsed)
             return parsed
 
         except Exception as e:
-            logger.error(f"Error with OpenAI API: {e}")
+            logger.error("Error with OpenAI API: %s", e)
             return {"sentiment": "Neutral", "related_companies": []}
     
+    def analyze_articles(self, texts, texts_lower=None):
+        """
+        Analyze several news articles with a single GPT request
+        
+        Articles found in the analysis cache are not sent. Falls back to one
+        concurrent request per article if the batch request fails or doesn't
+        return exactly one result per article.
+        
+        Args:
+            texts (list): Article texts
+            texts_lower (list): The same texts lower-cased, if the caller already has them
+            
+        Returns:
+            list: Analysis dict per article, in the same order as texts
+        """
+        if texts_lower is None:
+            texts_lower = [text.lower() for text in texts]
+        cache_keys = [get_analysis_cache_key(text_lower) for text_lower in texts_lower]
+        
+        analyses = [self.get_cached_analysis(cache_key) for cache_key in cache_keys]
+        missing = [i for i, analysis in enumerate(analyses) if analysis is None]
+        
+        if len(missing) < len(texts):
+            logger.info("Using cached GPT analysis for %s of %s articles", len(texts) - len(missing), len(texts))
+        if not missing:
+            return analyses
+        
+        requested = self.request_analyses([texts[i] for i in missing], [cache_keys[i] for i in missing])
+        for i, analysis in zip(missing, requested):
+            analyses[i] = analysis
+        return analyses
+    
+    def request_analyses(self, texts, cache_keys):
+        """
+        Send articles to GPT for analysis in one batched request (see analyze_articles())
+        
+        Args:
+            texts (list): Article texts
+            cache_keys (list): Analysis cache key of each text
+            
+        Returns:
+            list: Analysis dict per article, in the same order as texts
+        """
+        articles_json = json.dumps([{"id": i, "text": truncate_article(text)} for i, text in enumerate(texts)])
+        
+        prompt = f"""
+You are a financial trading assistant. You are given a JSON array of {len(texts)} news articles.
+For each article determine:
+
+1. Market sentiment: Bullish, Bearish, or Neutral
+2. A list of up to 3 major publicly traded companies affected. Return exact company names, not ticker symbols.
+   IMPORTANT: Only include companies that are publicly traded on stock exchanges.
+
+Return a JSON object with a "results" array containing one item per article, in the same order.
+
+Format:
+{{
+  "results": [
+    {{"id": 0, "sentiment": "Bullish", "related_companies": ["Apple", "Tesla"]}}
+  ]
+}}
+
+Articles:
+{articles_json}
+"""
+        
+        try:
+            logger.info("Sending batched request for %s articles to OpenAI API", len(texts))
+            
+            response = openai_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are a market-savvy financial assistant."},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3
+            )
+            
+            results = load_json_bytes(response.choices[0].message.content).get("results")
+            if isinstance(results, list) and len(results) == len(texts) and all(isinstance(r, dict) for r in results):
+                # Put results back in article order in case the ids came back shuffled
+                ids = [r.get("id") for r in results]
+                if sorted(ids) == list(range(len(texts))):
+                    results = sorted(results, key=lambda r: r["id"])
+                
+                logger.info("GPT batch response received")
+                for cache_key, analysis in zip(cache_keys, results):
+                    self.cache_analysis(cache_key, analysis)
+                return results
+            
+            logger.warning("GPT batch response didn't contain %s results, analyzing articles individually", len(texts))
+        except Exception as e:
+            logger.error("Error in batched article analysis, analyzing articles individually: %s", e)
+        
+        # Send the articles one per request, concurrently so the request latencies overlap
+        with ThreadPoolExecutor(max_workers=min(NEWS_ANALYSIS_WORKERS, len(texts))) as executor:
+            return list(executor.map(self.analyze_article, texts, cache_keys))
+    
     def match_company_to_symbol(self, company_name, symbols_to_check):
         """Match company name to stock symbol"""
-        # Define common company name variations
-        company_aliases = {
-            "apple": "AAPL",
-            "microsoft": "MSFT",
-            "amazon": "AMZN",
-            "google": "GOOGL",
-            "alphabet": "GOOGL",
-            "meta": "META",
-            "facebook": "META",
-            "tesla": "TSLA",
-            "nvidia": "NVDA",
-            "amd": "AMD",
-            "advanced micro devices": "AMD",
-            "intel": "INTC",
-            "ibm": "IBM",
-            "international business machines": "IBM"
-        }
-        
         # Try direct lookup
         company_lower = company_name.lower()
-        if company_lower in company_aliases:
-            symbol = company_aliases[company_lower]
+        symbol = COMPANY_ALIASES.get(company_lower)
+        if symbol in symbols_to_check:
+            return symbol
+        
+        # Look for an alias inside longer names such as "Apple Inc." or "NVIDIA Corporation"
+        for symbol in find_alias_symbols(company_lower):
             if symbol in symbols_to_check:
                 return symbol
         
@@ -577,23 +940,40 @@ Article:
             
             news_results = []
             
+            # Lower-case each article once, for the alias scan and the analysis cache keys
+            texts = [f"{article.get('title', 'Untitled article')} {article.get('content', '')}" for article in articles]
+            texts_lower = [text.lower() for text in texts]
+            
+            # Only articles that mention a tracked company can change a symbol's sentiment,
+            # so the rest never go to GPT
+            relevant = [i for i, text_lower in enumerate(texts_lower) if find_alias_symbols(text_lower)]
+            if len(relevant) < len(articles):
+                logger.info("Skipping GPT for %s articles that don't mention a tracked company", len(articles) - len(relevant))
+            
+            # Analyze the remaining articles with GPT in one go
+            analyses = [None] * len(articles)
+            relevant_analyses = self.analyze_articles([texts[i] for i in relevant], [texts_lower[i] for i in relevant])
+            for i, analysis in zip(relevant, relevant_analyses):
+                analyses[i] = analysis
+            
             # Process each article
-            for article in articles:
+            for article, analysis in zip(articles, analyses):
                 try:
                     # Process article
                     title = article.get('title', 'Untitled article')
                     # Use ASCII encoding to avoid logging errors with non-English characters
                     safe_title = ''.join(char for char in title if ord(char) < 128)
-                    logger.info(f"Processing: {safe_title[:100]}...")
+                    logger.info("Processing: %s...", safe_title[:100])
+                    
+                    # Off-topic article, nothing to update
+                    if analysis is None:
+                        continue
                     
-                    # Analyze with GPT
-                    full_text = f"{title} {article.get('content', '')}"
-                    analysis = self.analyze_article(full_text)
                     sentiment = analysis.get("sentiment", "Neutral")
                     related_companies = analysis.get("related_companies", [])
                     
-                    logger.info(f"Sentiment: {sentiment}")
-                    logger.info(f"Related companies: {related_companies}")
+                    logger.info("Sentiment: %s", sentiment)
+                    logger.info("Related companies: %s", related_companies)
                     
                     # Match to symbols
                     for company in related_companies:
@@ -602,7 +982,7 @@ Article:
                         if not symbol:
                             continue
                             
-                        logger.info(f"Matched company '{company}' to symbol {symbol}")
+                        logger.info("Matched company '%s' to symbol %s", company, symbol)
                         
                         # Update sentiment for this symbol
                         if symbol not in self.news_sentiment:
@@ -630,24 +1010,24 @@ Article:
                         })
                     
                 except Exception as e:
-                    logger.error(f"Error processing article: {e}")
+                    logger.error("Error processing article: %s", e)
                     continue
             
             # Save updated sentiment data
             self.save_state()
             
-            logger.info(f"Processed {len(articles)} articles, updated sentiment for {len(news_results)} symbol-article pairs")
+            logger.info("Processed %s articles, updated sentiment for %s symbol-article pairs", len(articles), len(news_results))
             return news_results
             
         except Exception as e:
-            logger.error(f"Error processing news data: {e}")
+            logger.error("Error processing news data: %s", e)
             return []
     
-    def get_combined_signal(self, symbol):
+    def get_combined_signal(self, symbol, price_data=None):
         """Combine ORB strategy signal with news sentiment to get final trading decision"""
         try:
             # Get ORB signal
-            orb_data = self.check_orb_signals(symbol)
+            orb_data = self.check_orb_signals(symbol, price_data=price_data)
             if not orb_data:
                 return ("HOLD", 0.5, {"reason": "No ORB data available"})
             
@@ -696,7 +1076,7 @@ Article:
                 sentiment_label = "Neutral"
                 sentiment_signal = "HOLD"
                 
-            logger.info(f"Average sentiment for {symbol}: {avg_sentiment:.2f} ({sentiment_label})")
+            logger.info("Average sentiment for %s: %.2f (%s)", symbol, avg_sentiment, sentiment_label)
             
             # Decision logic:
             # If ORB and sentiment agree, use that signal with high confidence
@@ -729,7 +1109,7 @@ Article:
             })
             
         except Exception as e:
-            logger.error(f"Error generating combined signal for {symbol}: {e}")
+            logger.error("Error generating combined signal for %s: %s", symbol, e)
             return ("HOLD", 0.5, {"reason": f"Error: {str(e)}"})
     
     def execute_trade(self, symbol, decision, confidence, account, reason_data=None):
@@ -741,7 +1121,7 @@ Article:
         
         # If market is closed and queue is available, queue the trade
         if not market_open and QUEUE_AVAILABLE:
-            logger.info(f"Market is closed, queueing {decision} for {symbol}")
+            logger.info("Market is closed, queueing %s for %s", decision, symbol)
             
             # Convert confidence to sentiment string
             if confidence > 0.7:
@@ -770,7 +1150,7 @@ Article:
         
         # If market is closed and queue is not available, log and return
         if not market_open and not QUEUE_AVAILABLE:
-            logger.info(f"Market is closed and trade_queue module not available, cannot trade {symbol}")
+            logger.info("Market is closed and trade_queue module not available, cannot trade %s", symbol)
             return {
                 "symbol": symbol,
                 "decision": decision,
@@ -812,7 +1192,7 @@ Article:
                 # Calculate quantity
                 quantity = int(position_size / price)
                 if quantity < 1:
-                    logger.info(f"Position size too small for {symbol}: ${position_size:.2f} / ${price:.2f} = {quantity}")
+                    logger.info("Position size too small for %s: $%.2f / $%.2f = %s", symbol, position_size, price, quantity)
                     return {
                         "symbol": symbol,
                         "decision": decision,
@@ -824,12 +1204,12 @@ Article:
                 
                 # Check if we already have this position
                 try:
-                    positions = alpaca.list_positions()
+                    positions = get_positions()
                     current_positions = {p.symbol: p for p in positions}
                     
                     if symbol in current_positions:
                         existing_position = current_positions[symbol]
-                        logger.info(f"Already have position in {symbol}: {existing_position.qty} shares at ${float(existing_position.avg_entry_price):.2f}")
+                        logger.info("Already have position in %s: %s shares at $%.2f", symbol, existing_position.qty, float(existing_position.avg_entry_price))
                         
                         return {
                             "symbol": symbol,
@@ -840,14 +1220,14 @@ Article:
                             "queued": False
                         }
                 except Exception as e:
-                    logger.warning(f"Error checking existing positions: {e}")
+                    logger.warning("Error checking existing positions: %s", e)
                 
                 # Calculate stop loss and take profit prices
                 stop_loss_price = price * (1 - ORB_STOP_LOSS_PCT)
                 take_profit_price = price * (1 + ORB_PROFIT_TARGET_PCT)
                 
                 # Submit market order
-                logger.info(f"Buying {quantity} shares of {symbol} at ~${price:.2f}")
+                logger.info("Buying %s shares of %s at ~$%.2f", quantity, symbol, price)
                 try:
                     order = alpaca.submit_order(
                         symbol=symbol,
@@ -856,6 +1236,7 @@ Article:
                         type="market",
                         time_in_force="day"
                     )
+                    invalidate_account_cache()
                     
                     # Save order details
                     order_details = {
@@ -874,28 +1255,10 @@ Article:
                     # Add stop loss and take profit orders
                     try:
                         # Wait for the main order to fill
-                        order_filled = False
-                        max_wait_time = 60  # seconds
-                        start_time = time.time()
-                        
-                        while not order_filled and (time.time() - start_time) < max_wait_time:
-                            try:
-                                order_status = alpaca.get_order(order.id)
-                                
-                                if order_status.status == "filled":
-                                    order_filled = True
-                                    logger.info(f"Order filled: {quantity} shares of {symbol}")
-                                    break
-                                    
-                                elif order_status.status in ["rejected", "canceled"]:
-                                    logger.warning(f"Order was {order_status.status}: {symbol}")
-                                    break
-                                    
-                                # Wait a bit before checking again
-                                time.sleep(2)
-                            except Exception as e:
-                                logger.error(f"Error checking order status: {e}")
-                                break
+                        order_status = self.wait_for_order_fill(order.id)
+                        order_filled = order_status is not None and order_status.status == "filled"
+                        if order_filled:
+                            logger.info("Order filled: %s shares of %s", quantity, symbol)
                         
                         # If order was filled, add stop loss and take profit orders
                         if order_filled:
@@ -908,7 +1271,7 @@ Article:
                                 time_in_force="day",
                                 stop_price=stop_loss_price
                             )
-                            logger.info(f"Submitted stop loss order for {symbol} at ${stop_loss_price:.2f}")
+                            logger.info("Submitted stop loss order for %s at $%.2f", symbol, stop_loss_price)
                             
                             # Submit take profit order
                             profit_order = alpaca.submit_order(
@@ -919,13 +1282,13 @@ Article:
                                 time_in_force="day",
                                 limit_price=take_profit_price
                             )
-                            logger.info(f"Submitted take profit order for {symbol} at ${take_profit_price:.2f}")
+                            logger.info("Submitted take profit order for %s at $%.2f", symbol, take_profit_price)
                             
                             # Update order details
                             order_details["stop_loss_order_id"] = stop_order.id
                             order_details["take_profit_order_id"] = profit_order.id
                     except Exception as e:
-                        logger.error(f"Error setting stop loss/take profit for {symbol}: {e}")
+                        logger.error("Error setting stop loss/take profit for %s: %s", symbol, e)
                     
                     # Save order to file
                     self.save_order_details(order_details)
@@ -943,7 +1306,7 @@ Article:
                     }
                     
                 except Exception as e:
-                    logger.error(f"Error submitting buy order for {symbol}: {e}")
+                    logger.error("Error submitting buy order for %s: %s", symbol, e)
                     return {
                         "symbol": symbol,
                         "decision": decision,
@@ -960,7 +1323,7 @@ Article:
                     quantity = int(position.qty)
                     
                     # Submit market order to sell all shares
-                    logger.info(f"Selling {quantity} shares of {symbol}")
+                    logger.info("Selling %s shares of %s", quantity, symbol)
                     order = alpaca.submit_order(
                         symbol=symbol,
                         qty=quantity,
@@ -968,6 +1331,7 @@ Article:
                         type="market",
                         time_in_force="day"
                     )
+                    invalidate_account_cache()
                     
                     # Save order details
                     order_details = {
@@ -994,7 +1358,7 @@ Article:
                     }
                     
                 except Exception as e:
-                    logger.error(f"Error selling {symbol}: {e}")
+                    logger.error("Error selling %s: %s", symbol, e)
                     return {
                         "symbol": symbol,
                         "decision": decision,
@@ -1005,7 +1369,7 @@ Article:
                     }
             
             else:  # HOLD or other decision
-                logger.info(f"No action needed for {symbol} with decision: {decision}")
+                logger.info("No action needed for %s with decision: %s", symbol, decision)
                 return {
                     "symbol": symbol,
                     "decision": decision,
@@ -1016,7 +1380,7 @@ Article:
                 }
         
         except Exception as e:
-            logger.error(f"Error executing trade for {symbol}: {e}")
+            logger.error("Error executing trade for %s: %s", symbol, e)
             return {
                 "symbol": symbol,
                 "decision": decision,
@@ -1026,6 +1390,43 @@ Article:
                 "queued": False
             }
     
+    def wait_for_order_fill(self, order_id, timeout=60):
+        """
+        Poll an order until it is filled, rejected or canceled
+        
+        Market orders usually fill within a few hundred ms, so the first polls are
+        quick and the interval then doubles up to ORDER_POLL_MAX_SECONDS.
+        
+        Args:
+            order_id (str): Alpaca order ID
+            timeout (int): Seconds to wait before giving up
+            
+        Returns:
+            Order: The order in its final state, or None on timeout or error
+        """
+        start_time = time.time()
+        delay = ORDER_POLL_INITIAL_SECONDS
+        
+        while (time.time() - start_time) < timeout:
+            try:
+                order = alpaca.get_order(order_id)
+                
+                if order.status == "filled":
+                    return order
+                elif order.status in ["rejected", "canceled"]:
+                    logger.warning("Order %s was %s", order_id, order.status)
+                    return order
+                
+                # Wait a bit before checking again
+                time.sleep(delay)
+                delay = min(delay * 2, ORDER_POLL_MAX_SECONDS)
+            except Exception as e:
+                logger.error("Error checking order status: %s", e)
+                return None
+        
+        logger.warning("Timeout waiting for order %s to fill", order_id)
+        return None
+    
     def calculate_position_size(self, symbol, confidence, account):
         """Calculate position size based on portfolio value and confidence"""
         try:
@@ -1042,10 +1443,10 @@ Article:
             # Cap at available cash (with 5% buffer)
             position_size = min(adjusted_size, cash * 0.95)
             
-            logger.info(f"Calculated position size for {symbol}: ${position_size:.2f} (confidence: {confidence:.2f})")
+            logger.info("Calculated position size for %s: $%.2f (confidence: %.2f)", symbol, position_size, confidence)
             return position_size
         except Exception as e:
-            logger.error(f"Error calculating position size: {e}")
+            logger.error("Error calculating position size: %s", e)
             return 0
     
     def save_order_details(self, order_details):
@@ -1060,18 +1461,20 @@ Article:
             filename = f"data/orders/{timestamp}_{symbol}_{order_details['decision']}.json"
             
             # Save to file
-            with open(filename, "w") as f:
-                json.dump(order_details, f, indent=2)
+            Path(filename).write_bytes(dump_json_bytes(order_details))
                 
-            logger.info(f"Saved order details to {filename}")
+            logger.info("Saved order details to %s", filename)
             
         except Exception as e:
-            logger.error(f"Error saving order details: {e}")
+            logger.error("Error saving order details: %s", e)
     
     def run_trading_cycle(self):
         """Run a complete trading cycle"""
         logger.info("Starting trading cycle")
         
+        # Bars from an earlier cycle are stale
+        self.bars_cache = {}
+        
         results = []
         
         try:
@@ -1082,35 +1485,43 @@ Article:
                     import trade_queue_processor
                     queue_results = trade_queue_processor.main()
                     if queue_results:
-                        logger.info(f"Processed {len(queue_results)} queued trades with sentiment verification")
+                        logger.info("Processed %s queued trades with sentiment verification", len(queue_results))
                 except Exception as e:
-                    logger.error(f"Error processing trade queue: {e}")
+                    logger.error("Error processing trade queue: %s", e)
             
             # Get Alpaca account
             logger.info("Connecting to Alpaca account")
-            account = alpaca.get_account()
-            logger.info(f"Connected to Alpaca account: {account.id}")
-            logger.info(f"Cash balance: ${float(account.cash):.2f}")
-            logger.info(f"Portfolio value: ${float(account.portfolio_value):.2f}")
+            account = get_account()
+            logger.info("Connected to Alpaca account: %s", account.id)
+            pv = float(account.portfolio_value)
+            cash = float(account.cash)
+            logger.info("Cash balance: $%.2f", cash)
+            logger.info("Portfolio value: $%.2f", pv)
             
             # Process news data first (this also saves state)
             self.process_news_data()
             
-            # Calculate opening ranges if not done yet
-            for symbol in SYMBOLS_TO_TRACK:
-                if symbol not in self.orb_ranges:
-                    self.calculate_opening_range(symbol)
+            # Calculate opening ranges if not done yet, downloading the 1-minute
+            # bars for all missing symbols in one request
+            pending_symbols = [symbol for symbol in SYMBOLS_TO_TRACK if symbol not in self.orb_ranges]
+            if pending_symbols:
+                self.fetch_historical_bars_batch(pending_symbols, timeframe="1Min", limit=60)
+            for symbol in pending_symbols:
+                self.calculate_opening_range(symbol)
+            
+            # Fetch current prices for all symbols up front, concurrently
+            market_data = self.get_current_market_data_batch(SYMBOLS_TO_TRACK)
             
             # Process each symbol
             for symbol in SYMBOLS_TO_TRACK:
                 try:
-                    logger.info(f"Processing symbol: {symbol}")
+                    logger.info("Processing symbol: %s", symbol)
                     
-                    # Get combined signal
-                    decision, confidence, reason_data = self.get_combined_signal(symbol)
+                    # Get combined signal (fetches the price again if the prefetch missed it)
+                    decision, confidence, reason_data = self.get_combined_signal(symbol, price_data=market_data.get(symbol))
                     
-                    logger.info(f"Decision for {symbol}: {decision} (confidence: {confidence:.2f})")
-                    logger.info(f"Reason: {reason_data['reason']}")
+                    logger.info("Decision for %s: %s (confidence: %.2f)", symbol, decision, confidence)
+                    logger.info("Reason: %s", reason_data['reason'])
                     
                     # Execute or queue trade
                     trade_result = self.execute_trade(symbol, decision, confidence, account, reason_data)
@@ -1130,42 +1541,43 @@ Article:
                     results.append(result)
                     
                 except Exception as e:
-                    logger.error(f"Error processing symbol {symbol}: {e}")
+                    logger.error("Error processing symbol %s: %s", symbol, e)
                     continue
             
             # Save final results
             try:
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 
-                # Get updated account info
-                account = alpaca.get_account()
+                # Get updated account info (refetched if any order went in)
+                account = get_account()
+                pv = float(account.portfolio_value)
+                cash = float(account.cash)
                 portfolio_value = {
-                    'cash': float(account.cash),
-                    'portfolio_value': float(account.portfolio_value),
-                    'positions_value': float(account.portfolio_value) - float(account.cash)
+                    'cash': cash,
+                    'portfolio_value': pv,
+                    'positions_value': pv - cash
                 }
                 
-                with open(f"data/trading_results_{timestamp}.json", "w") as f:
-                    json.dump({
-                        "timestamp": datetime.datetime.now().isoformat(),
-                        "portfolio_value": portfolio_value,
-                        "results": results
-                    }, f, indent=2)
+                Path(f"data/trading_results_{timestamp}.json").write_bytes(dump_json_bytes({
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "portfolio_value": portfolio_value,
+                    "results": results
+                }))
                 
                 logger.info("Results saved to file")
             except Exception as e:
-                logger.error(f"Error saving results: {e}")
+                logger.error("Error saving results: %s", e)
             
             # Print summary
             logger.info("\nTRADING RESULTS SUMMARY:")
-            logger.info(f"Processed {len(SYMBOLS_TO_TRACK)} symbols")
-            logger.info(f"Made {len(results)} trading decisions")
-            logger.info(f"Portfolio value: ${float(account.portfolio_value):.2f}")
+            logger.info("Processed %s symbols", len(SYMBOLS_TO_TRACK))
+            logger.info("Made %s trading decisions", len(results))
+            logger.info("Portfolio value: $%.2f", pv)
             
             return results
             
         except Exception as e:
-            logger.error(f"Error in trading cycle: {e}")
+            logger.error("Error in trading cycle: %s", e)
             return results
         
 def test_timezone():
@@ -1176,27 +1588,27 @@ def test_timezone():
     local_now = datetime.datetime.now()
     
     logger.info("=== Timezone Test ===")
-    logger.info(f"UTC time: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.info(f"ET time: {et_now.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-    logger.info(f"Local time: {local_now.strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info(f"Is DST active in ET: {et_now.dst() != datetime.timedelta(0)}")
+    logger.info("UTC time: %s", utc_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+    logger.info("ET time: %s", et_now.strftime('%Y-%m-%d %H:%M:%S %Z'))
+    logger.info("Local time: %s", local_now.strftime('%Y-%m-%d %H:%M:%S'))
+    logger.info("Is DST active in ET: %s", et_now.dst() != datetime.timedelta(0))
     
     # Try to get local timezone name
     try:
         local_tz = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
-        logger.info(f"Local timezone: {local_tz}")
+        logger.info("Local timezone: %s", local_tz)
     except Exception as e:
-        logger.error(f"Could not determine local timezone: {e}")
+        logger.error("Could not determine local timezone: %s", e)
     
     # Compare different ways of getting Eastern Time
     if TIMEZONE_UTILS_AVAILABLE:
         utils_et = get_eastern_time()
-        logger.info(f"ET time via timezone_utils: {utils_et.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+        logger.info("ET time via timezone_utils: %s", utils_et.strftime('%Y-%m-%d %H:%M:%S %Z'))
         
         if utils_et.hour != et_now.hour:
-            logger.error(f"TIMEZONE INCONSISTENCY: hours don't match! Direct: {et_now.hour}, Utils: {utils_et.hour}")
+            logger.error("TIMEZONE INCONSISTENCY: hours don't match! Direct: %s, Utils: %s", et_now.hour, utils_et.hour)
         else:
-            logger.info(f"Timezone consistency check passed: ET hour is {et_now.hour}")
+            logger.info("Timezone consistency check passed: ET hour is %s", et_now.hour)
     
     return et_now 
 
@@ -1219,14 +1631,14 @@ def verify_api_keys(check_type="all"):
     # Check Alpaca API
     if check_type in ["all", "alpaca"]:
         try:
-            account = alpaca.get_account()
+            account = get_account()
             results["details"]["alpaca"] = {
                 "success": True,
                 "account_id": account.id,
                 "portfolio_value": float(account.portfolio_value),
                 "cash": float(account.cash)
             }
-            logger.info(f"Alpaca API connection successful: Account ID {account.id}")
+            logger.info("Alpaca API connection successful: Account ID %s", account.id)
         except Exception as e:
             error_msg = f"Alpaca API error: {e}"
             results["errors"].append(error_msg)
@@ -1260,7 +1672,7 @@ def verify_api_keys(check_type="all"):
     if check_type in ["all", "news"]:
         try:
             url = f"https://newsapi.org/v2/everything?q=test&pageSize=1&apiKey={NEWS_API_KEY}"
-            response = requests.get(url)
+            response = SESSION.get(url, timeout=30)
             if response.status_code == 200:
                 results["details"]["news"] = {
                     "success": True,
@@ -1298,7 +1710,7 @@ def main():
     if not api_results["success"]:
         logger.error("API key verification failed:")
         for error in api_results["errors"]:
-            logger.error(f"  - {error}")
+            logger.error("  - %s", error)
         
         if "openai" in api_results["details"] and not api_results["details"]["openai"]["success"]:
             logger.error("OpenAI API key is not working - please check your .env file")
@@ -1314,7 +1726,7 @@ def main():
         return results
         
     except Exception as e:
-        logger.error(f"Unhandled error in bot: {e}")
+        logger.error("Unhandled error in bot: %s", e)
         return None
 
 if __name__ == "__main__":